@@ -0,0 +1,57 @@
+r"""
+Compare the speed of the JSON decoders available to WOTXResponse.
+
+Decodes payloads shaped like the API's largest responses (a page of 1000 top
+players and the vehicle statistics of 100 players) with every decoder that is
+installed. Bodies recorded from the API may be passed as extra arguments to
+benchmark them as well::
+
+    python benchmarks/decoders.py [recorded.json ...]
+"""
+
+import json
+import sys
+import timeit
+
+from payloads import tank_statistics, top_players
+from wotconsole.decoders import _third_party, get_decoder
+
+
+def bodies(paths):
+    found = [
+        ('top_players', json.dumps(top_players()).encode('utf-8')),
+        ('tank_statistics', json.dumps(tank_statistics()).encode('utf-8'))
+    ]
+    for path in paths:
+        with open(path, 'rb') as f:
+            found.append((path, f.read()))
+    return found
+
+
+def decoders():
+    found = [('json', get_decoder('json'))]
+    for name, _ in _third_party:
+        try:
+            found.append((name, get_decoder(name)))
+        except ImportError:
+            pass
+    return found
+
+
+def main(paths):
+    found = decoders()
+    print('{:<20} {:>10} {:<10} {:>10} {:>8}'.format(
+        'payload', 'bytes', 'decoder', 'ms/decode', 'speedup'))
+    for name, body in bodies(paths):
+        baseline = None
+        for decoder_name, decoder in found:
+            number = 20
+            best = min(timeit.repeat(lambda: decoder(body), number=number,
+                                     repeat=5)) / number
+            baseline = baseline or best
+            print('{:<20} {:>10} {:<10} {:>10.3f} {:>7.1f}x'.format(
+                name, len(body), decoder_name, best * 1000, baseline / best))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,194 @@
+r"""
+Microbenchmarks for the client's hot paths, run against canned responses
+without touching the network.
+
+Covers the parameter helpers, the ``validate_realm`` and ``automerge``
+wrappers, building and merging responses, and the overhead of each call made
+through a session. Results can be saved as JSON and compared against an
+earlier run, failing if anything got slower than allowed::
+
+    python benchmarks/hotpaths.py --json before.json
+    python benchmarks/hotpaths.py --compare before.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+from requests.models import Response
+
+from payloads import player_data, tank_statistics, top_players
+from wotconsole import WOTXResponse, WOTXSession, api
+from wotconsole.utils import _join_param, automerge, chunker, validate_realm
+
+
+def canned(body):
+    r"""
+    Wrap an encoded body in a :py:class:`requests.Response`, as if it had
+    just been received
+    """
+    response = Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = body
+    return response
+
+
+class CannedTransport(object):
+    r"""
+    Transport answering every request with a canned response for the
+    requested accounts, so that only the client's own work is measured
+    """
+
+    def __init__(self):
+        self._bodies = {}
+
+    def fetch(self, url, params, timeout):
+        key = params.get('account_id')
+        body = self._bodies.get(key)
+        if body is None:
+            ids = [int(i) for i in str(key).split(',')]
+            body = self._bodies[key] = json.dumps(
+                player_data(ids)).encode('utf-8')
+        return WOTXResponse(canned(body))
+
+    def close(self):
+        pass
+
+
+def encode(body):
+    return json.dumps(body).encode('utf-8')
+
+
+def benchmarks():
+    r"""
+    Every benchmark, by name
+    """
+    ids_1000 = list(range(1000))
+    ids_100 = list(range(100))
+    small = encode(player_data([1]))
+    hundred = encode(player_data(ids_100))
+    top = encode(top_players())
+    chunks = [encode(player_data(range(n, n + 100)))
+              for n in range(0, 1000, 100)]
+    tanks = [encode(tank_statistics(1, 60)) for _ in range(5)]
+
+    @validate_realm
+    def realm_checked(api_realm='xbox'):
+        return api_realm
+
+    @automerge('account_id', 100, 0)
+    def merged(account_id):
+        return WOTXResponse(canned(small))
+
+    @automerge('account_id', 100, 0)
+    def split(account_id):
+        return WOTXResponse(canned(chunks[account_id[0] // 100]))
+
+    def merge(bodies):
+        first = WOTXResponse(canned(bodies[0]))
+        for body in bodies[1:]:
+            first += WOTXResponse(canned(body))
+        return first
+
+    transport = CannedTransport()
+    sess = WOTXSession(transport=transport)
+    return {
+        'chunker_list_1000': lambda: list(chunker(ids_1000, 100)),
+        'chunker_range_10000': lambda: list(chunker(range(10000), 100)),
+        'join_param_str': lambda: _join_param('1,2,3'),
+        'join_param_list_100': lambda: _join_param(ids_100),
+        'validate_realm': lambda: realm_checked(api_realm='ps4'),
+        'automerge_unsplit': lambda: merged(ids_100),
+        'automerge_split_1000': lambda: split(ids_1000),
+        'response_init_1': lambda: WOTXResponse(canned(small)),
+        'response_init_100': lambda: WOTXResponse(canned(hundred)),
+        'response_init_top_1000': lambda: WOTXResponse(canned(top)),
+        'response_iadd_dict_10x100': lambda: merge(chunks),
+        'response_iadd_tanks_5x60': lambda: merge(tanks),
+        'api_player_data_1': lambda: api.player_data(
+            1, 'demo', session=transport),
+        'session_player_data_1': lambda: sess.player_data(1),
+        'session_player_data_1000': lambda: sess.player_data(ids_1000),
+    }
+
+
+def measure(func, repeat=5, target=0.2):
+    r"""
+    Time a benchmark, running it enough times per round to take at least
+    ``target`` seconds
+
+    :return: Best and median time per call, in nanoseconds, and calls per
+             round
+    :rtype: tuple(float, float, int)
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < target / 10:
+        number *= 10
+    times = sorted(t / number for t in timer.repeat(repeat, number))
+    return times[0] * 1e9, times[len(times) // 2] * 1e9, number
+
+
+def run(selected, repeat):
+    results = {}
+    for name, func in sorted(benchmarks().items()):
+        if selected and not any(word in name for word in selected):
+            continue
+        best, median, number = measure(func, repeat)
+        results[name] = {'best_ns': best, 'median_ns': median,
+                         'loops': number}
+        print('{:<28} {:>14.0f} ns {:>14.0f} ns'.format(name, best, median))
+    return results
+
+
+def compare(results, baseline, threshold):
+    r"""
+    List benchmarks that got slower than ``threshold`` (a fraction) allows
+    """
+    slower = []
+    for name, result in sorted(results.items()):
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        change = result['best_ns'] / before['best_ns'] - 1
+        print('{:<28} {:>+8.1%}'.format(name, change))
+        if change > threshold:
+            slower.append(name)
+    return slower
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('benchmarks', nargs='*',
+                        help='Only run benchmarks with these words in their '
+                             'names')
+    parser.add_argument('--json', help='Save the results to this file')
+    parser.add_argument('--compare', help='Results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Slowdown allowed when comparing, as a fraction')
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(args)
+    print('{:<28} {:>17} {:>17}'.format('benchmark', 'best', 'median'))
+    results = run(options.benchmarks, options.repeat)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'machine': platform.machine(),
+                'results': results
+            }, f, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare) as f:
+            slower = compare(results, json.load(f), options.threshold)
+        if slower:
+            print('Slower than allowed: ' + ', '.join(slower))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+r"""
+Synthetic API response bodies shaped like the real thing, for benchmarks
+"""
+
+import random
+
+
+def player_data(ids):
+    r"""
+    Body of a :py:func:`~.player_data` response
+    """
+    data = {}
+    for account_id in ids:
+        rng = random.Random(account_id)
+        data[str(account_id)] = {
+            'account_id': account_id,
+            'nickname': 'player{}'.format(account_id),
+            'created_at': rng.randint(1400000000, 1500000000),
+            'last_battle_time': rng.randint(1500000000, 1600000000),
+            'statistics': {
+                'all': {'battles': rng.randint(0, 60000),
+                        'wins': rng.randint(0, 30000),
+                        'damage_dealt': rng.randint(0, 50000000)},
+                'max_xp': rng.randint(0, 4000)
+            }
+        }
+    return {'status': 'ok', 'meta': {'count': len(data)}, 'data': data}
+
+
+def top_players(count=1000):
+    r"""
+    Body of a :py:func:`~.top_players` response with ``limit=1000``
+    """
+    rng = random.Random(1)
+    data = []
+    for rank in range(1, count + 1):
+        data.append({
+            'account_id': rng.randint(1000, 20000000),
+            'battles_count': {'rank': rank, 'value': rng.randint(1, 60000)},
+            'damage_avg': {'rank': rank, 'value': rng.random() * 3000},
+            'frags_avg': {'rank': rank, 'value': rng.random() * 2},
+            'global_rating': {'rank': rank, 'value': rng.randint(1, 12000)},
+            'wins_ratio': {'rank': rank, 'value': rng.random() * 100},
+            'xp_avg': {'rank': rank, 'value': rng.random() * 1500}
+        })
+    return {'status': 'ok', 'meta': {'count': count}, 'data': data}
+
+
+def tank_statistics(players=100, tanks=60):
+    r"""
+    Body of a :py:func:`~.player_tank_statistics` response for 100 players
+    """
+    rng = random.Random(2)
+    data = {}
+    for account_id in range(players):
+        data[str(5000 + account_id)] = [{
+            'account_id': 5000 + account_id,
+            'tank_id': rng.randint(1, 65000),
+            'last_battle_time': rng.randint(1400000000, 1500000000),
+            'mark_of_mastery': rng.randint(0, 4),
+            'max_frags': rng.randint(0, 10),
+            'max_xp': rng.randint(0, 3000),
+            'trees_cut': rng.randint(0, 5000),
+            'all': dict((stat, rng.randint(0, 100000)) for stat in (
+                'battles', 'wins', 'losses', 'damage_dealt',
+                'damage_received', 'frags', 'spotted', 'shots', 'hits',
+                'piercings', 'capture_points', 'dropped_capture_points',
+                'survived_battles', 'xp', 'battle_life_time'))
+        } for _ in range(tanks)]
+    return {'status': 'ok', 'meta': {'count': players}, 'data': data}
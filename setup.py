@@ -15,5 +15,11 @@ setup(
     license='LICENSE.TXT',
     long_description=long_description,
     packages=['wotconsole'],
-    install_requires=['requests>=2.22.0']
+    install_requires=['requests>=2.22.0'],
+    extras_require={
+        'async': ['aiohttp>=3.6'],
+        'columnar': ['numpy'],
+        'compression': ['brotli', 'zstandard'],
+        'fast': ['orjson']
+    }
 )
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+
+from requests.models import Response
+
+from wotconsole.api import WOTXResponse, _update
+
+
+def canned(body):
+    response = Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = json.dumps(body).encode('utf-8')
+    return response
+
+
+def slow_decoder(body):
+    time.sleep(0.01)
+    return json.loads(body.decode('utf-8'))
+
+
+def test_lazy_decode_from_many_threads():
+    body = {'status': 'ok', 'meta': {'count': 1}, 'data': {'1': {'x': 1}}}
+    for keep_raw in (True, False):
+        response = WOTXResponse(canned(body), lazy=True, keep_raw=keep_raw,
+                                decoder=slow_decoder)
+        start = threading.Barrier(16)
+        results, errors = [], []
+
+        def read():
+            start.wait()
+            try:
+                results.append((response.meta, response.data))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert results == [(body['meta'], body['data'])] * 16
+
+
+def test_update_keeps_lists_over_none():
+    tanks = [{'tank_id': 1}]
+    data = {'1': tanks, '2': None, '3': [{'tank_id': 3}]}
+    _update(data, {'1': None, '2': [{'tank_id': 2}], '3': [{'tank_id': 4}],
+                   '4': None})
+    assert data == {'1': [{'tank_id': 1}], '2': [{'tank_id': 2}],
+                    '3': [{'tank_id': 3}, {'tank_id': 4}], '4': None}
+    assert data['1'] is tanks
+
+
+def test_lazy_decode_does_not_block_other_responses():
+    body = {'status': 'ok', 'meta': {'count': 1}, 'data': {'1': {'x': 1}}}
+    started, release = threading.Event(), threading.Event()
+
+    def stuck_decoder(raw):
+        started.set()
+        release.wait(10)
+        return json.loads(raw.decode('utf-8'))
+
+    stuck = WOTXResponse(canned(body), lazy=True, decoder=stuck_decoder)
+    other = WOTXResponse(canned(body), lazy=True)
+    thread = threading.Thread(target=lambda: stuck.data)
+    thread.start()
+    try:
+        assert started.wait(10)
+        assert other.data == {'1': {'x': 1}}
+        assert thread.is_alive()
+    finally:
+        release.set()
+        thread.join()
+    assert stuck.data == {'1': {'x': 1}}
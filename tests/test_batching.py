@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+from wotconsole import StandInServer, WOTXSession, api
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=1000) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+def test_lazy_responses_shared_between_batched_lookups(server):
+    sess = WOTXSession(lazy=True, batch_window=0.02)
+    start = threading.Barrier(40)
+    results, errors = {}, []
+
+    def lookup(account_id):
+        start.wait()
+        try:
+            results[account_id] = sess.player_data(account_id).data
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup, args=(n, ))
+               for n in range(1, 41)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert server.requests < 40
+    for account_id, data in results.items():
+        assert list(data) == [str(account_id)]
+        assert data[str(account_id)]['account_id'] == account_id
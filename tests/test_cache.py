@@ -0,0 +1,58 @@
+import pytest
+from requests.models import Response
+
+from wotconsole import StandInServer, WOTXSession, api
+from wotconsole.cache import _normalize
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=100) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+def test_equivalent_parameters_share_a_key():
+    assert _normalize({'tank_id': '3,1,2', 'application_id': 'a',
+                       'fields': None, 'language': 'en'}) == \
+        _normalize({'language': 'en', 'tank_id': [1, 2, 3],
+                    'application_id': 'b', 'access_token': 'c'})
+    assert _normalize({'tank_id': '1'}) != _normalize({'tank_id': '2'})
+
+
+def test_responses_are_shared_between_sessions(server, tmpdir):
+    first = WOTXSession(cache_dir=str(tmpdir))
+    vehicles = first.vehicle_info(tank_id=[1, 2]).data
+    # The version check and the request itself
+    assert server.requests == 2
+    second = WOTXSession(cache_dir=str(tmpdir))
+    assert second.vehicle_info(tank_id='2,1').data == vehicles
+    assert server.requests == 2
+
+
+def test_responses_are_dropped_when_the_version_changes(server, tmpdir):
+    sess = WOTXSession(cache_dir=str(tmpdir))
+    sess.transport.cache.check_interval = 0
+    sess.vehicle_info(tank_id=1)
+    sess.vehicle_info(tank_id=1)
+    # Only the version was checked again
+    assert server.requests == 3
+    server.seed += 1
+    sess.vehicle_info(tank_id=1)
+    assert server.requests == 5
+    sess.vehicle_info(tank_id=1)
+    assert server.requests == 6
+
+
+@pytest.mark.parametrize('keep_raw', [False, 'summary'])
+def test_cached_responses_follow_the_transport(server, tmpdir, keep_raw):
+    sess = WOTXSession(cache_dir=str(tmpdir), keep_raw=keep_raw, lazy=True)
+    sent = sess.vehicle_info(tank_id=1)
+    cached = sess.vehicle_info(tank_id=1)
+    assert server.requests == 2
+    assert cached.data == sent.data
+    if keep_raw:
+        assert cached.raw.status_code == 200
+        assert not isinstance(cached.raw, Response)
+    else:
+        assert cached.raw is None
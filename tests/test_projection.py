@@ -0,0 +1,88 @@
+import pytest
+
+from wotconsole import StandInServer, WOTXSession, api
+from wotconsole.transport import WOTXTransport
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=1000, clans=100) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+def test_fields_are_learned(server):
+    sess = WOTXSession(learn_fields=True)
+    for _ in range(3):
+        player = sess.player_data([1, 2]).data['1']
+        assert player['nickname']
+        assert player['statistics']['all']['wins'] >= 0
+    assert server.requests == 3
+    learned, = sess.learner.learned().values()
+    assert learned == ['nickname', 'statistics.all.wins']
+    # Only what was asked for came back
+    assert set(dict.keys(player)) == {'nickname', 'statistics'}
+
+
+def test_missing_field_is_fetched_once(server):
+    sess = WOTXSession(learn_fields=True)
+    for n in range(4):
+        player = sess.player_data(1).data['1']
+        assert player['nickname']
+        if n >= 1:
+            assert player['created_at'] > 0
+    # The second call left out created_at and had to fetch it
+    assert server.requests == 5
+    learned, = sess.learner.learned().values()
+    assert learned == ['created_at', 'nickname']
+
+
+def test_requested_field_left_out_is_not_refetched(server):
+    sess = WOTXSession(learn_fields=True)
+    for _ in range(3):
+        player = sess.player_data(1).data['1']
+        assert 'clan' not in player
+    assert server.requests == 3
+
+
+def test_iterating_asks_for_everything(server):
+    sess = WOTXSession(learn_fields=True)
+    for _ in range(2):
+        player = sess.player_data(1).data['1']
+        assert 'statistics' in list(player)
+    assert list(sess.learner.learned().values()) == [None]
+
+
+def test_calls_passing_fields_are_left_alone(server):
+    sess = WOTXSession(learn_fields=True)
+    player = sess.player_data(1, fields='nickname').data['1']
+    assert list(player) == ['nickname']
+    assert sess.learner.learned() == {}
+
+
+def test_streamed_calls_are_left_alone(server):
+    sess = WOTXSession(learn_fields=True)
+    records = dict(sess.stream('player_data', [1, 2]))
+    assert sorted(records) == ['1', '2']
+    records = dict(sess.stream('clan_details', [1, 2]))
+    assert sorted(records) == ['1', '2']
+    assert sess.learner.learned() == {}
+
+
+def test_calls_to_several_realms_are_left_alone(server):
+    sess = WOTXSession(api_realm=('xbox', 'ps4'), learn_fields=True)
+    responses = sess.player_data(1)
+    assert sorted(responses) == ['ps4', 'xbox']
+    assert sorted(sess.player_tank_statistics(1)) == ['ps4', 'xbox']
+    assert sess.learner.learned() == {}
+
+
+def test_calls_through_another_transport_are_left_alone(server):
+    sess = WOTXSession(learn_fields=True)
+    transport = WOTXTransport()
+    try:
+        assert '1' in sess.player_data(1, session=transport).data
+        assert '1' in sess.clan_details(1, session=transport).data
+    finally:
+        transport.close()
+    assert sess.learner.learned() == {}
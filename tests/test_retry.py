@@ -0,0 +1,83 @@
+import pytest
+
+from wotconsole import Metrics, RetryPolicy, StandInServer, WOTXSession, api
+from wotconsole.api import WOTXResponseError
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=1000) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+def policy(**kwargs):
+    kwargs.setdefault('retries', 20)
+    return RetryPolicy(backoff=0, jitter=False, **kwargs)
+
+
+def error(message):
+    return WOTXResponseError({'status': 'error', 'error': {
+        'code': 407, 'message': message, 'field': None, 'value': None}})
+
+
+def test_retryable_errors():
+    retry = RetryPolicy()
+    assert retry.retryable(error('REQUEST_LIMIT_EXCEEDED'))
+    assert retry.retryable(error('SOURCE_NOT_AVAILABLE'))
+    assert not retry.retryable(error('INVALID_ACCOUNT_ID'))
+    assert not retry.retryable(ValueError('not JSON'))
+    assert RetryPolicy(codes=['INVALID_ACCOUNT_ID']).retryable(
+        error('INVALID_ACCOUNT_ID'))
+
+
+def test_invalid_requests_are_not_retried(server):
+    sess = WOTXSession(retry=policy())
+    with pytest.raises(WOTXResponseError) as e:
+        sess.player_data('1,x')
+    assert e.value.error['message'] == 'INVALID_ACCOUNT_ID'
+    assert server.requests == 1
+
+
+def test_rate_limited_requests_are_retried(server):
+    server.rate_limit = 5
+    retry = RetryPolicy(retries=50, backoff=0.05, max_backoff=0.2)
+    sess = WOTXSession(retry=retry)
+    for account_id in range(1, 11):
+        assert sess.player_data(account_id).data
+    assert server.requests > 10
+
+
+def test_retries_stop_when_the_budget_runs_out(server):
+    server.error_rate = 1
+    retry = policy(budget=3)
+    sess = WOTXSession(retry=retry)
+    with pytest.raises(WOTXResponseError) as e:
+        sess.player_data(1)
+    assert e.value.error['message'] == 'SOURCE_NOT_AVAILABLE'
+    assert server.requests == 4
+    assert retry.remaining == 0
+    with pytest.raises(WOTXResponseError):
+        sess.player_data(1)
+    assert server.requests == 5
+
+
+def test_retries_per_request_are_limited(server):
+    server.error_rate = 1
+    sess = WOTXSession(retry=policy(retries=2))
+    with pytest.raises(WOTXResponseError):
+        sess.player_data(1)
+    assert server.requests == 3
+
+
+def test_only_failed_chunks_are_sent_again(server):
+    server.error_rate = 0.3
+    metrics = Metrics()
+    sess = WOTXSession(retry=policy(), metrics=metrics)
+    players = sess.player_data(range(1, 1001)).data
+    assert sorted(players, key=int) == [str(n) for n in range(1, 1001)]
+    retries = sum(stats['retries'] for stats in
+                  metrics.snapshot()['endpoints'].values())
+    assert retries > 0
+    # Ten chunks of 100, plus one request for every retry
+    assert server.requests == 10 + retries
@@ -0,0 +1,60 @@
+import pytest
+import requests
+
+from wotconsole import StandInServer
+
+
+@pytest.fixture
+def server():
+    with StandInServer(players=100, clans=10) as stand_in:
+        yield stand_in
+
+
+def get(server, endpoint, **params):
+    params.setdefault('application_id', 'demo')
+    response = requests.get(server.url.format('xbox') + endpoint,
+                            params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize('endpoint, name', [
+    ('account/info/', 'account_id'),
+    ('account/achievements/', 'account_id'),
+    ('clans/info/', 'clan_id'),
+    ('clans/accountinfo/', 'account_id'),
+    ('tanks/stats/', 'account_id'),
+    ('ratings/neighbors/', 'account_id'),
+    ('encyclopedia/vehiclepackages/', 'tank_id')
+])
+def test_missing_ids(server, endpoint, name):
+    body = get(server, endpoint)
+    assert body['status'] == 'error'
+    assert body['error']['code'] == 402
+    assert body['error']['message'] == name.upper() + '_NOT_SPECIFIED'
+    assert body['error']['field'] == name
+
+
+@pytest.mark.parametrize('endpoint, params', [
+    ('account/list/', {'search': 'player', 'limit': 'ten'}),
+    ('clans/list/', {'page_no': 'first'}),
+    ('ratings/top/', {'rank_field': 'wins', 'limit': '1.5'}),
+    ('account/info/', {'account_id': '1,x'})
+])
+def test_invalid_numbers(server, endpoint, params):
+    body = get(server, endpoint, **params)
+    assert body['status'] == 'error'
+    assert body['error']['code'] == 407
+    name, = [name for name in params
+             if name not in ('search', 'rank_field')]
+    assert body['error']['message'] == 'INVALID_' + name.upper()
+
+
+def test_unexpected_errors_are_answered(server, monkeypatch):
+    def broken(*args):
+        raise RuntimeError('broken')
+
+    monkeypatch.setattr(server, 'handle', broken)
+    body = get(server, 'account/info/', account_id='1')
+    assert body['status'] == 'error'
+    assert body['error']['message'] == 'INTERNAL_SERVER_ERROR'
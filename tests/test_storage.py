@@ -0,0 +1,85 @@
+import pytest
+
+from wotconsole import SQLiteStore
+
+
+@pytest.fixture
+def store(tmpdir):
+    with SQLiteStore(str(tmpdir.join('realm.db')), batch_size=1) as store:
+        yield store
+
+
+def rows(store, query, *args):
+    return store.connection.execute(query, args).fetchall()
+
+
+def member(account_id, role='private'):
+    return {'account_id': account_id, 'account_name': 'p{}'.format(account_id),
+            'role': role, 'joined_at': 1500000000}
+
+
+def test_players_are_replaced(store):
+    store.save_players({'1': {'nickname': 'a', 'statistics': {
+        'all': {'battles': 10, 'wins': 5}}}, '2': None})
+    store.save_players({'1': {'nickname': 'b', 'statistics': {
+        'all': {'battles': 12, 'wins': 6}}}})
+    assert rows(store, 'SELECT account_id, nickname, battles, wins '
+                       'FROM players') == [(1, 'b', 12, 6)]
+
+
+def test_tank_statistics_are_keyed_by_player_and_tank(store):
+    store.save_tank_statistics({'1': [{'tank_id': 1, 'all': {'wins': 1}},
+                                      {'tank_id': 2, 'all': {'wins': 2}}]})
+    store.save_tank_statistics({'1': [{'tank_id': 2, 'all': {'wins': 3}}],
+                                '2': None})
+    assert rows(store, 'SELECT account_id, tank_id, wins '
+                       'FROM tank_statistics ORDER BY tank_id') == [
+        (1, 1, 1), (1, 2, 3)]
+
+
+@pytest.mark.parametrize('listed', [False, True])
+def test_clan_members_are_replaced(store, listed):
+    def clan(*members):
+        if listed:
+            return {'tag': 'TAG', 'members': list(members)}
+        return {'tag': 'TAG', 'members': dict(
+            (str(m['account_id']), m) for m in members)}
+
+    store.save_clans({'7': clan(member(1, 'commander'), member(2))})
+    store.save_clans({'7': clan(member(1, 'commander'), member(3))})
+    assert rows(store, 'SELECT account_id, clan_id, role FROM clan_members '
+                       'ORDER BY account_id') == [
+        (1, 7, 'commander'), (3, 7, 'private')]
+    # Without members, those stored are kept
+    store.save_clans({'7': {'tag': 'NEW'}})
+    assert rows(store, 'SELECT tag FROM clans') == [('NEW', )]
+    assert len(rows(store, 'SELECT * FROM clan_members')) == 2
+
+
+def test_players_who_left_their_clan_are_removed(store):
+    store.save_clan_memberships({'1': dict(member(1), clan_id=7),
+                                 '2': dict(member(2), clan_id=7)})
+    store.save_clan_memberships({'1': None})
+    assert rows(store, 'SELECT account_id FROM clan_members') == [(2, )]
+
+
+def test_rows_are_written_once_the_batch_is_full(tmpdir):
+    path = str(tmpdir.join('realm.db'))
+    store = SQLiteStore(path, batch_size=3)
+    store.save_players(dict((str(n), {'nickname': str(n)})
+                            for n in range(1, 3)))
+    other = SQLiteStore(path)
+    assert rows(other, 'SELECT COUNT(*) FROM players') == [(0, )]
+    store.save_players({'3': {'nickname': '3'}})
+    assert rows(other, 'SELECT COUNT(*) FROM players') == [(3, )]
+    store.save_players({'4': {'nickname': '4'}})
+    assert rows(other, 'SELECT COUNT(*) FROM players') == [(3, )]
+    store.close()
+    assert rows(other, 'SELECT COUNT(*) FROM players') == [(4, )]
+    other.close()
+
+
+def test_unknown_sinks(store):
+    assert store.sink('player_data') == store.save_players
+    with pytest.raises(ValueError):
+        store.sink('player_search')
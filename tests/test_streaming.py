@@ -0,0 +1,99 @@
+import json
+import random
+
+import pytest
+
+from wotconsole.api import WOTXResponseError
+from wotconsole.streaming import RecordParser, iter_records
+
+players = {
+    '1': {'nickname': 'Zé', 'created_at': 1400000000,
+          'statistics': {'all': {'wins': 12, 'ratio': -0.5e-3}}},
+    '2': None,
+    '3': {'nickname': 'a "quoted" \\ name', 'tags': [1, [2, 3], {}],
+          'banned': False, 'clan': None}
+}
+
+tanks = [{'tank_id': 1, 'in_garage': True}, {'tank_id': 2}, 7, 'x']
+
+
+def body(data, **fields):
+    fields.setdefault('status', 'ok')
+    fields.setdefault('meta', {'count': len(data)})
+    fields['data'] = data
+    return json.dumps(fields, indent=1, ensure_ascii=False).encode('utf-8')
+
+
+def splits(raw, parts):
+    cuts = sorted(random.sample(range(1, len(raw)), parts - 1))
+    return [raw[start:end] for start, end in
+            zip([0] + cuts, cuts + [len(raw)])]
+
+
+@pytest.mark.parametrize('data', [players, tanks, {}, []])
+def test_records_split_at_every_byte(data):
+    raw = body(data)
+    expected = list(data.items()) if isinstance(data, dict) else \
+        list(enumerate(data))
+    for n in range(1, len(raw)):
+        parser = RecordParser()
+        records = parser.feed(raw[:n]) + parser.feed(raw[n:])
+        records += parser.close()
+        assert records == expected
+        assert parser.fields == {'status': 'ok',
+                                 'meta': {'count': len(data)}}
+
+
+def test_records_in_random_chunks():
+    random.seed(13)
+    raw = body(players)
+    for _ in range(50):
+        chunks = splits(raw, random.randint(2, 40))
+        assert dict(iter_records(chunks)) == players
+    assert dict(iter_records(raw[n:n + 1] for n in range(len(raw)))) == \
+        players
+
+
+def test_records_returned_once_complete():
+    parser = RecordParser()
+    assert parser.feed(b'{"status":"ok","data":{"1":{"nick') == []
+    assert parser.feed(b'name":"a"},"2":12') == [('1', {'nickname': 'a'})]
+    # Could still be 123
+    assert parser.feed(b'3}') == [('2', 123)]
+    assert parser.feed(b'}') == []
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize('raw', [
+    b'{"status":"error","error":{"code":407,"message":"INVALID_IP",'
+    b'"field":null,"value":null}}',
+    b'{"error":{"code":504,"message":"SOURCE_NOT_AVAILABLE"}}'
+])
+def test_error_bodies(raw):
+    for n in range(1, len(raw)):
+        with pytest.raises(WOTXResponseError):
+            list(iter_records([raw[:n], raw[n:]]))
+
+
+def test_error_after_data():
+    raw = (b'{"data":{"1":{}},"status":"error",'
+           b'"error":{"code":1,"message":"X"}}')
+    parser = RecordParser()
+    assert parser.feed(raw) == [('1', {})]
+    with pytest.raises(WOTXResponseError):
+        parser.close()
+
+
+@pytest.mark.parametrize('raw', [
+    b'{"status":"ok","data":{"1":{}}',
+    b'{"status":"ok","data":[1,2',
+    b''
+])
+def test_truncated_bodies(raw):
+    with pytest.raises(ValueError):
+        list(iter_records([raw]))
+
+
+def test_invalid_bodies():
+    with pytest.raises(ValueError):
+        list(iter_records([b'<html>502 Bad Gateway</html>']))
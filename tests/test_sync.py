@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from wotconsole import DeltaSync, StandInServer, WOTXSession, api
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=150) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+class Sink(object):
+    def __init__(self, fail_after=None):
+        self.players = {}
+        self.fail_after = fail_after
+
+    def __call__(self, account_id, player, tanks):
+        if len(self.players) == self.fail_after:
+            raise RuntimeError('sink failed')
+        self.players[account_id] = (player, tanks)
+
+
+def test_unchanged_players_are_skipped(server, tmpdir):
+    snapshot = str(tmpdir.join('players.snapshot'))
+    sess = WOTXSession()
+    sink = Sink()
+    sync = DeltaSync(sess, sink, snapshot, batch_size=60)
+    # IDs past 150 do not exist
+    assert sync.sync(range(1, 161)) == 150
+    player, tanks = sink.players['7']
+    assert player['account_id'] == 7
+    assert tanks and tanks[0]['account_id'] == 7
+    requests = server.requests
+    assert DeltaSync(sess, Sink(), snapshot).sync(range(1, 161)) == 0
+    # Only the cheap check was sent
+    assert server.requests == requests + 2
+
+
+def test_changed_players_are_delivered(server, tmpdir):
+    snapshot = str(tmpdir.join('players.snapshot'))
+    sess = WOTXSession()
+    DeltaSync(sess, Sink(), snapshot, tanks=False).sync(range(1, 51))
+    with open(snapshot) as f:
+        state = json.load(f)
+    state['players']['3'][0] -= 1
+    del state['players']['9']
+    with open(snapshot, 'w') as f:
+        json.dump(state, f)
+    sink = Sink()
+    sync = DeltaSync(sess, sink, snapshot, tanks=False)
+    assert sync.sync(range(1, 51)) == 2
+    assert sorted(sink.players) == ['3', '9']
+    assert sink.players['3'][1] is None
+
+
+def test_snapshot_is_kept_when_a_sync_fails(server, tmpdir):
+    snapshot = str(tmpdir.join('players.snapshot'))
+    sess = WOTXSession()
+    sync = DeltaSync(sess, Sink(fail_after=20), snapshot)
+    with pytest.raises(RuntimeError):
+        sync.sync(range(1, 51))
+    with open(snapshot) as f:
+        assert len(json.load(f)['players']) == 20
+    sink = Sink()
+    assert DeltaSync(sess, sink, snapshot).sync(range(1, 51)) == 30
+    assert DeltaSync(sess, Sink(), snapshot).sync(range(1, 51)) == 0
+
+
+def test_snapshot_fields_must_match(server, tmpdir):
+    snapshot = str(tmpdir.join('players.snapshot'))
+    DeltaSync(WOTXSession(), Sink(), snapshot, tanks=False).sync([1])
+    with pytest.raises(ValueError):
+        DeltaSync(WOTXSession(), Sink(), snapshot, fields=['nickname'])
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import zlib
+from functools import partial
+
+import pytest
+import requests
+
+from wotconsole import RetryPolicy, StandInServer, WOTXSession, api
+from wotconsole.metrics import Metrics
+from wotconsole.transport import WOTXTransport
+
+
+class Chunks(object):
+    r"""
+    Calls for a split request, noting how far ahead of the finished calls
+    they are taken
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.taken = 0
+        self.finished = 0
+        self.ahead = 0
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        for n in range(self.count):
+            with self._lock:
+                self.taken += 1
+                self.ahead = max(self.ahead, self.taken - self.finished)
+            yield partial(self.lookup, n)
+
+    def lookup(self, n):
+        with self._lock:
+            self.finished += 1
+        return n
+
+    async def lookup_async(self, n):
+        await asyncio.sleep(0)
+        return self.lookup(n)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_dispatch_takes_chunks_as_they_are_sent(max_workers):
+    metrics = Metrics()
+    transport = WOTXTransport(max_workers=max_workers, metrics=metrics)
+    chunks = Chunks(50)
+    try:
+        assert transport.dispatch(chunks, list) == list(range(50))
+    finally:
+        transport.close()
+    assert chunks.ahead <= max(max_workers * 2, 1)
+    assert metrics.snapshot()['splits'] == {
+        'lookup': {'calls': 1, 'chunks': 50, 'max_chunks': 50}}
+
+
+def test_dispatch_async_bounds_chunks_in_flight():
+    aio = pytest.importorskip('wotconsole.aio')
+    pytest.importorskip('aiohttp')
+    metrics = Metrics()
+    transport = aio.AsyncWOTXTransport(pool_maxsize=5, metrics=metrics)
+    chunks = Chunks(50)
+
+    def calls():
+        for call in chunks:
+            yield partial(chunks.lookup_async, *call.args)
+
+    merged = asyncio.run(transport.dispatch(calls(), list))
+    assert merged == list(range(50))
+    assert chunks.ahead <= 5
+    assert metrics.snapshot()['splits'] == {
+        'lookup_async': {'calls': 1, 'chunks': 50, 'max_chunks': 50}}
+
+
+def test_async_session_needs_async_with():
+    aio = pytest.importorskip('wotconsole.aio')
+    pytest.importorskip('aiohttp')
+    sess = aio.AsyncWOTXSession('demo')
+    with pytest.raises(TypeError, match='async with'):
+        with sess:
+            pass
+
+    async def use():
+        async with sess as entered:
+            return entered
+
+    assert asyncio.run(use()) is sess
+
+
+def test_async_wire_bytes_of_chunked_gzip():
+    aio = pytest.importorskip('wotconsole.aio')
+    web = pytest.importorskip('aiohttp.web')
+    data = dict((str(n), {'account_id': n}) for n in range(200))
+    body = json.dumps({'status': 'ok', 'meta': {'count': 200},
+                       'data': data}).encode('utf-8')
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    gzipped = compressor.compress(body) + compressor.flush()
+
+    async def handler(request):
+        # Chunked, so the length is not stated up front
+        response = web.StreamResponse(headers={'Content-Encoding': 'gzip'})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for n in range(0, len(gzipped), 100):
+            await response.write(gzipped[n:n + 100])
+        await response.write_eof()
+        return response
+
+    async def fetch():
+        app = web.Application()
+        app.router.add_get('/wotx/account/info/', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = 'http://127.0.0.1:{}/wotx/account/info/'.format(port)
+        metrics = Metrics()
+        transport = aio.AsyncWOTXTransport(metrics=metrics)
+        try:
+            response = await transport.fetch(url, {}, 10)
+            records = [record async for record in
+                       transport.stream_records(url, {}, 10, 64)]
+        finally:
+            await transport.close()
+            await runner.cleanup()
+        return metrics, response, records
+
+    metrics, response, records = asyncio.run(fetch())
+    assert response.data == data
+    assert dict(records) == data
+    # Streamed requests are measured too
+    stats, = metrics.snapshot()['endpoints'].values()
+    assert stats['requests'] == 2
+    assert stats['bytes'] == 2 * len(body)
+    assert stats['wire_bytes'] == 2 * len(gzipped)
+    assert stats['encodings'] == {'gzip': 2}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(players=300) as stand_in:
+        monkeypatch.setattr(api, 'api_url', stand_in.url)
+        yield stand_in
+
+
+def test_streamed_requests_are_retried_and_measured(server):
+    server.error_rate = 0.5
+    metrics = Metrics()
+    sess = WOTXSession(metrics=metrics, retry=RetryPolicy(
+        retries=20, backoff=0, jitter=False))
+    records = dict(sess.stream('player_data', range(1, 301)))
+    assert sorted(records, key=int) == [str(n) for n in range(1, 301)]
+    stats, = metrics.snapshot()['endpoints'].values()
+    assert stats['retries'] > 0
+    assert stats['requests'] == server.requests == 3 + stats['retries']
+    assert stats['errors'] == {'SOURCE_NOT_AVAILABLE': stats['retries']}
+    assert stats['bytes'] > 0
+
+
+def test_streamed_requests_check_the_http_status(server, monkeypatch):
+    monkeypatch.setattr(server, 'handle', lambda *args: (503, {}))
+    metrics = Metrics()
+    sess = WOTXSession(metrics=metrics)
+    with pytest.raises(requests.HTTPError):
+        list(sess.stream('player_data', [1]))
+    stats, = metrics.snapshot()['endpoints'].values()
+    assert stats['requests'] == 1
@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+from requests.models import Response
+
+from wotconsole import StandInServer, WOTXSession, api
+from wotconsole.api import WOTXResponse
+from wotconsole.utils import _not_iter, _write, automerge, chunker
+
+
+def response(data):
+    raw = Response()
+    raw.status_code = 200
+    raw.encoding = 'utf-8'
+    raw._content = json.dumps({
+        'status': 'ok', 'meta': {'count': len(data)}, 'data': data
+    }).encode('utf-8')
+    return WOTXResponse(raw)
+
+
+def merged_ids(limit=3):
+    calls = []
+
+    @automerge('ids', limit, 0)
+    def lookup(ids):
+        calls.append(ids)
+        return ids
+
+    return lookup, calls
+
+
+def test_write_bare_filename(tmpdir):
+    with tmpdir.as_cwd():
+        _write('players.snapshot', b'{}')
+        with open('players.snapshot', 'rb') as f:
+            assert f.read() == b'{}'
+        assert os.listdir('.') == ['players.snapshot']
+
+
+def test_write_creates_directories(tmpdir):
+    path = os.path.join(str(tmpdir), 'cache', 'xbox', 'entry.json')
+    _write(path, b'data')
+    with open(path, 'rb') as f:
+        assert f.read() == b'data'
+
+
+def test_chunker_reads_iterables_once():
+    assert list(chunker((n for n in range(7)), 3)) == [
+        [0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunker(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunker([1, 2, 3, 4], 2)) == [[1, 2], [3, 4]]
+    assert list(chunker((1, 2, 3), 2)) == [(1, 2), (3, )]
+    assert list(chunker([], 2)) == []
+
+
+def test_automerge_scalars_are_not_split():
+    lookup, calls = merged_ids()
+    for ident in (7, '7,8,9,10', 7.0, None):
+        assert lookup(ident) == ident
+    assert calls == [7, '7,8,9,10', 7.0, None]
+
+
+def test_numpy_integers_are_single_ids(monkeypatch):
+    numpy = pytest.importorskip('numpy')
+    assert _not_iter(numpy.int64(7))
+    assert not _not_iter(numpy.arange(3))
+    with StandInServer(players=100) as server:
+        monkeypatch.setattr(api, 'api_url', server.url)
+        sess = WOTXSession()
+        players = sess.player_data(numpy.int64(5)).data
+        assert players['5']['account_id'] == 5
+        players = sess.player_data(numpy.arange(1, 151)).data
+        assert sorted(players, key=int) == [str(n) for n in range(1, 151)]
+        tanks = sess.player_tank_statistics(numpy.int32(5)).data
+        assert tanks['5']
+
+
+def test_automerge_within_limit_is_not_split():
+    lookup, calls = merged_ids()
+    assert lookup([1, 2, 3]) == [1, 2, 3]
+    assert lookup(n for n in (1, 2, 3)) == [1, 2, 3]
+    assert lookup([]) == []
+    assert calls == [[1, 2, 3], [1, 2, 3], []]
+
+
+def test_automerge_splits_generators():
+    calls = []
+
+    @automerge('ids', 3, 0)
+    def lookup(ids):
+        calls.append(ids)
+        return response(dict((str(n), {'n': n}) for n in ids))
+
+    merged = lookup(n for n in range(1, 8))
+    assert calls == [[1, 2, 3], [4, 5, 6], [7]]
+    assert sorted(merged.data, key=int) == [str(n) for n in range(1, 8)]
+    assert merged.meta['count'] == 7
@@ -2,6 +2,8 @@ r"""
 Wrapper for WarGaming's Console API
 """
 
+import sys
+
 from .api import (
     player_search, player_data, player_achievements, player_data_uid,
     player_sign_in, extend_player_sign_in, player_sign_out, clan_search,
@@ -9,7 +11,28 @@ from .api import (
     packages_info, equipment_consumable_info, achievement_info,
     tankopedia_info, types_of_ratings, dates_with_ratings, player_ratings,
     adjacent_positions_in_ratings, top_players, player_tank_statistics,
-    player_tank_achievements, WOTXResponse, WOTXResponseError
+    player_tank_achievements, WOTXResponse, WOTXResponseError,
+    ResponseSummary
 )
 
+from .batching import RequestBatcher
+from .cache import TankopediaCache
+from .cassette import Cassette, RecordingAdapter, ReplayAdapter
+from .columnar import tank_statistics_columns
+from .compression import accept_encoding
+from .compression import available as available_encodings
+from .crawler import Crawler, JSONLinesSink
+from .decoders import get_decoder, stdlib_decoder
+from .metrics import Metrics
+from .projection import FieldLearner
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .server import StandInServer
+from .storage import SQLiteStore
 from .session import WOTXSession
+from .streaming import RecordParser, iter_records
+from .sync import DeltaSync
+from .transport import WOTXTransport
+
+if sys.version_info >= (3, 6):
+    from .aio import AsyncWOTXSession, AsyncWOTXTransport
@@ -0,0 +1,571 @@
+r"""
+Asynchronous counterparts of :py:class:`~.WOTXSession` and
+:py:class:`~.WOTXTransport`, built on :py:mod:`asyncio` and ``aiohttp``
+"""
+
+import asyncio
+import zlib
+from collections import deque
+from time import monotonic
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from .api import WOTXResponse
+from .compression import accept_encoding, encodings
+from .decoders import get_decoder
+from .metrics import _counted
+from .session import WOTXSession, _cache, _limiter, _metrics, _retry
+from .streaming import RecordParser, _Streaming
+from .utils import _last_page
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncWOTXTransport(object):
+    r"""
+    Non-blocking HTTP transport for WG's API.
+
+    Requests are sent through a shared ``aiohttp`` connection pool, limited to
+    ``pool_maxsize`` open connections per realm. Requests beyond that wait for
+    a connection to free up, so the pool size is also the maximum number of
+    requests in flight for each realm.
+
+    Passing this transport as the ``session`` parameter of any function in
+    :py:mod:`wotconsole.api` makes it return an awaitable instead of a
+    :py:class:`~.WOTXResponse`.
+
+    :param int pool_maxsize: Maximum connections kept open per realm
+    :param limiter: Throttle requests to stay under WG's rate limit
+    :type limiter: RateLimiter
+    :param cache: Save responses that only change with game updates
+    :type cache: TankopediaCache
+    :param bool lazy: Only decode response bodies once their data is accessed
+    :param keep_raw: What to keep of each :py:mod:`requests` response once
+                     its body is decoded: all of it (``True``), only its
+                     status code, URL and elapsed time (``'summary'``) or
+                     nothing (``False``)
+    :type keep_raw: bool or str
+    :param decoder: JSON decoder for response bodies: "orjson", "ujson",
+                    "simdjson", "json" or "auto" (the fastest installed), or
+                    any function decoding bytes. Left to :py:mod:`requests`
+                    by default
+    :type decoder: str or callable
+    :param retry: Retry failed requests (and chunks of split requests)
+    :type retry: RetryPolicy
+    :param metrics: Record the number, size, duration and outcome of every
+                    request
+    :type metrics: Metrics
+    :param compression: Encodings to ask for responses in: "auto" for every
+                        one that ``aiohttp`` can decode, ``None`` for
+                        uncompressed responses, or a list such as
+                        ``['gzip']``
+    :type compression: str or list(str)
+    :raises ImportError: If ``aiohttp`` is not installed
+    :raises ValueError: If an encoding cannot be decoded with the packages
+                        installed
+    """
+
+    def __init__(self, pool_maxsize=100, limiter=None, cache=None,
+                 lazy=False, keep_raw=True, decoder=None, retry=None,
+                 metrics=None, compression='auto'):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncWOTXTransport requires the "aiohttp" package')
+        self.accept_encoding = accept_encoding(compression, _supported())
+        self.pool_maxsize = pool_maxsize
+        self.limiter = limiter
+        self.cache = cache
+        self.lazy = lazy
+        self.keep_raw = keep_raw
+        self.decoder = None if decoder is None else get_decoder(decoder)
+        self.retry = retry
+        self.metrics = metrics
+        self._session = None
+
+    def _client(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0, limit_per_host=self.pool_maxsize),
+                headers={'Accept-Encoding': self.accept_encoding},
+                auto_decompress=False)
+        return self._session
+
+    async def fetch(self, url, params, timeout):
+        r"""
+        Send a request to the API and wrap the result
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters. Those set to ``None`` are dropped
+        :param int timeout: Maximum allowed time to wait for response from
+                            servers
+        :return: API response
+        :rtype: WOTXResponse
+        :raises WOTXResponseError: If the API returns with an "error" field
+        """
+        cache = self.cache
+        if cache is None or not cache.covers(url):
+            return await self._send(url, params, timeout)
+        check = cache.version_request(url, params)
+        if check is not None:
+            cache.update_version(
+                url, await self._send(check[0], check[1], timeout))
+        response = cache.load(url, params, lazy=self.lazy,
+                              keep_raw=self.keep_raw, decoder=self.decoder)
+        if response is None:
+            response = await self._send(url, params, timeout)
+            cache.save(url, params, response)
+        return response
+
+    async def stream_records(self, url, params, timeout, chunk_size=65536):
+        r"""
+        Send a request to the API and parse the response as it arrives. The
+        request is sent once iteration begins. Failures are retried as long as
+        no record has been yielded yet, and the request is measured once the
+        whole body has been read
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters. Those set to ``None`` are dropped
+        :param int timeout: Maximum allowed time to wait for response from
+                            servers
+        :param int chunk_size: Bytes to read from the connection at a time
+        :return: ``(key, record)`` pairs from the response's ``data``
+        :rtype: async_generator(tuple)
+        :raises WOTXResponseError: If the API returns with an "error" field
+        :raises aiohttp.ClientResponseError: If the server answers with an
+                                             HTTP error
+        """
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async for record in self._stream_attempt(
+                        url, params, timeout, chunk_size):
+                    started = True
+                    yield record
+                return
+            except Exception as e:
+                # Records already yielded cannot be taken back
+                if self.retry is None or started:
+                    raise
+                wait = self.retry.schedule(e, attempt)
+                if wait is None:
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retried(url, e)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def _stream_attempt(self, url, params, timeout, chunk_size):
+        if self.limiter is not None:
+            wait = self.limiter.reserve(params.get('application_id'))
+            if wait > 0:
+                await asyncio.sleep(wait)
+        params = dict((k, str(v)) for k, v in params.items() if v is not None)
+        start = monotonic()
+        size = wire_size = 0
+        try:
+            parser = RecordParser()
+            async with self._client().get(
+                    url, params=params,
+                    timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                resp.raise_for_status()
+                encoding = resp.headers.get('Content-Encoding')
+                decompressor = _decompressor(encoding)
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    wire_size += len(chunk)
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk)
+                    size += len(chunk)
+                    for record in parser.feed(chunk):
+                        yield record
+                if decompressor is not None:
+                    chunk = decompressor.flush()
+                    size += len(chunk)
+                    for record in parser.feed(chunk):
+                        yield record
+            for record in parser.close():
+                yield record
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record(url, monotonic() - start, size, e)
+            raise
+        if self.metrics is not None:
+            self.metrics.record(url, monotonic() - start, size,
+                                wire_size=wire_size, encoding=encoding)
+
+    async def _send(self, url, params, timeout):
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(url, params, timeout)
+            except Exception as e:
+                if self.retry is None:
+                    raise
+                wait = self.retry.schedule(e, attempt)
+                if wait is None:
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retried(url, e)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def _attempt(self, url, params, timeout):
+        if self.limiter is not None:
+            wait = self.limiter.reserve(params.get('application_id'))
+            if wait > 0:
+                await asyncio.sleep(wait)
+        params = dict((k, str(v)) for k, v in params.items() if v is not None)
+        start = monotonic()
+        body = raw = b''
+        try:
+            async with self._client().get(
+                    url, params=params,
+                    timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                if self.retry is not None and resp.status >= 500:
+                    resp.raise_for_status()
+                raw = body = await resp.read()
+            encoding = resp.headers.get('Content-Encoding')
+            decompressor = _decompressor(encoding)
+            if decompressor is not None:
+                body = decompressor.decompress(raw) + decompressor.flush()
+            result = WOTXResponse(_as_response(resp, body), lazy=self.lazy,
+                                  keep_raw=self.keep_raw, decoder=self.decoder)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record(url, monotonic() - start, len(body), e)
+            raise
+        if self.metrics is not None:
+            self.metrics.record(url, monotonic() - start, len(body),
+                                wire_size=len(raw), encoding=encoding)
+        return result
+
+    async def dispatch(self, calls, merge):
+        r"""
+        Send the chunks of a split request concurrently, up to
+        ``pool_maxsize`` at a time
+
+        :param calls: Callables returning an awaitable response for each chunk
+        :type calls: iterable
+        :param merge: Function combining the responses, in order
+        :return: Merged API response
+        :rtype: WOTXResponse
+        """
+        calls = _counted(calls, self.metrics)
+        return merge(await _bounded(calls, self.pool_maxsize))
+
+    async def fan_out(self, calls):
+        r"""
+        Send a request to several realms concurrently
+
+        :param calls: ``(realm, callable)`` pairs, each callable returning an
+                      awaitable response
+        :type calls: list(tuple)
+        :return: Response of each realm
+        :rtype: dict
+        """
+        responses = await asyncio.gather(*[call() for _, call in calls])
+        return dict(zip([realm for realm, _ in calls], responses))
+
+    async def close(self):
+        r"""
+        Close all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def _bounded(calls, limit):
+    r"""
+    Await the result of each call, in order, with up to ``limit`` of them
+    in flight at a time
+    """
+    results = []
+    pending = deque()
+    try:
+        for call in calls:
+            pending.append(asyncio.ensure_future(call()))
+            if len(pending) < limit:
+                continue
+            results.append(await pending.popleft())
+        while pending:
+            results.append(await pending.popleft())
+    finally:
+        for task in pending:
+            task.cancel()
+    return results
+
+
+def _supported():
+    r"""
+    Encodings that ``aiohttp`` can decode with the packages installed
+    """
+    try:
+        from aiohttp import compression_utils
+    except ImportError:
+        compression_utils = None
+    extra = {'br': getattr(compression_utils, 'HAS_BROTLI', False),
+             'zstd': getattr(compression_utils, 'HAS_ZSTD', False)}
+    return [name for name in encodings if extra.get(name, True)]
+
+
+def _decompressor(encoding):
+    r"""
+    Decoder of a response body sent with a content encoding, taking a chunk
+    at a time through ``decompress`` and finishing with ``flush``. ``None``
+    if the body is not encoded
+    """
+    if encoding is None:
+        return None
+    encoding = encoding.strip().lower()
+    if encoding in ('', 'identity'):
+        return None
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        # Reads gzip and zlib headers alike
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    if encoding in _supported():
+        from aiohttp import compression_utils
+        if encoding == 'br':
+            return _Decompressor(compression_utils.BrotliDecompressor())
+        return _Decompressor(compression_utils.ZSTDDecompressor())
+    raise ValueError(
+        'Responses encoded with "{}" cannot be decoded'.format(encoding))
+
+
+class _Decompressor(object):
+    r"""
+    One of ``aiohttp``'s decompressors, used the same way as :py:mod:`zlib`'s
+    """
+
+    def __init__(self, decompressor):
+        self.decompress = decompressor.decompress_sync
+        self.flush = decompressor.flush
+
+
+def _as_response(resp, body):
+    r"""
+    Convert an ``aiohttp`` response into a :py:class:`requests.Response` so
+    that it may be handled the same as a synchronous one
+    """
+    response = Response()
+    response.status_code = resp.status
+    response.reason = resp.reason
+    response.headers = CaseInsensitiveDict(resp.headers)
+    response.url = str(resp.url)
+    response.encoding = resp.charset
+    response._content = body
+    return response
+
+
+class _AsyncStreaming(_Streaming):
+    r"""
+    Stand-in for an asynchronous transport, making functions from
+    :py:mod:`wotconsole.api` return an asynchronous generator of records
+    """
+
+    def dispatch(self, calls, merge):
+        return _chain(calls)
+
+
+async def _chain(calls):
+    for call in calls:
+        async for record in call():
+            yield record
+
+
+class AsyncWOTXSession(WOTXSession):
+    r"""
+    Asynchronous API session wrapper.
+
+    Offers every method of :py:class:`~.WOTXSession`, but each one returns an
+    awaitable instead of blocking on the request. Requests that exceed the
+    API's parameter limits have all of their chunks sent at once.
+
+    .. code:: python
+
+        >>> async with AsyncWOTXSession('demo') as sess:
+        ...     players = await sess.player_data(range(5000, 5500))
+
+    :param str application_id: Your application key (generated by WG)
+    :param str language: Localized language
+    :param realm: Platform API. "xbox" or "ps4", or both (such as
+                  ``('xbox', 'ps4')``) to send every request to each realm
+                  at once
+    :type realm: str or tuple(str)
+    :param int pool_maxsize: Maximum connections (and thus requests in flight)
+                             per realm
+    :param float rate_limit: Maximum requests per second sent with each
+                             application ID. Unlimited by default
+    :param int burst: Requests that may be sent back-to-back before the rate
+                      limit kicks in
+    :param str cache_dir: Directory to cache Tankopedia responses in. Not
+                          cached by default
+    :param bool lazy: Only decode response bodies once their data is accessed
+    :param keep_raw: What to keep of each :py:mod:`requests` response once
+                     its body is decoded: all of it (``True``), only its
+                     status code, URL and elapsed time (``'summary'``) or
+                     nothing (``False``)
+    :type keep_raw: bool or str
+    :param decoder: JSON decoder for response bodies: "orjson", "ujson",
+                    "simdjson", "json" or "auto" (the fastest installed), or
+                    any function decoding bytes. Left to :py:mod:`requests`
+                    by default
+    :type decoder: str or callable
+    :param retry: Times to retry failed requests (and each chunk of split
+                  requests) with exponential backoff, or a
+                  :py:class:`~.RetryPolicy` for finer control. Not retried by
+                  default
+    :type retry: int or RetryPolicy
+    :param metrics: Record the number, size, duration and outcome of every
+                    request, per endpoint. Pass ``True`` to start recording,
+                    or a :py:class:`~.Metrics` to record into (for example,
+                    one with a callback). Read them from the session's
+                    ``metrics`` attribute
+    :type metrics: bool or Metrics
+    :param compression: Encodings to ask for responses in: "auto" for every
+                        one that ``aiohttp`` can decode, ``None`` for
+                        uncompressed responses, or a list such as
+                        ``['gzip']``
+    :type compression: str or list(str)
+    :param transport: Use an existing transport instead of creating one
+    :type transport: AsyncWOTXTransport
+    """
+
+    _streaming = _AsyncStreaming
+
+    def __init__(self, application_id='demo', language='en', api_realm='xbox',
+                 pool_maxsize=100, rate_limit=None, burst=None,
+                 cache_dir=None, lazy=False, keep_raw=True, decoder=None,
+                 retry=None, metrics=None, compression='auto',
+                 transport=None):
+        if transport is None:
+            transport = AsyncWOTXTransport(
+                pool_maxsize=pool_maxsize,
+                limiter=_limiter(rate_limit, burst),
+                cache=_cache(cache_dir),
+                lazy=lazy,
+                keep_raw=keep_raw,
+                decoder=decoder,
+                retry=_retry(retry),
+                metrics=_metrics(metrics),
+                compression=compression)
+        super(AsyncWOTXSession, self).__init__(
+            application_id, language, api_realm, transport=transport)
+
+    def __enter__(self):
+        raise TypeError(
+            'AsyncWOTXSession must be used with "async with", not "with"')
+
+    def __exit__(self, *args):
+        raise TypeError(
+            'AsyncWOTXSession must be used with "async with", not "with"')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        r"""
+        Close all pooled connections held by the session's transport
+        """
+        await self.transport.close()
+
+    def stream(self, method, *args, **kwargs):
+        r"""
+        Call one of the session's methods, yielding each entry of the
+        response's ``data`` as soon as it is received instead of waiting for
+        the whole response
+
+        .. code:: python
+
+            >>> async for rank, player in sess.stream(
+            ...         'top_players', 'wins', 'all', limit=1000):
+            ...     print(rank, player['account_id'])
+
+        :param str method: Name of the method to call, such as "top_players"
+        :return: ``(key, record)`` pairs, or ``(index, record)`` for methods
+                 returning a list
+        :rtype: async_generator(tuple)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Remaining arguments are passed on to the method
+        """
+        return super(AsyncWOTXSession, self).stream(method, *args, **kwargs)
+
+    def iter_top_players(self, rank_field, rating, page_no=1, limit=1000,
+                         prefetch=2, **kwargs):
+        r"""
+        Iterate over the list of top players, page by page
+
+        The next ``prefetch`` pages are requested concurrently while the
+        current one is being read. Iteration stops after the last page.
+
+        .. code:: python
+
+            >>> async for player in sess.iter_top_players('wins', 'all'):
+            ...     print(player['account_id'])
+
+        :param str rank_field: Rating category
+        :param str rating: Rating period
+        :param int page_no: Page to start from. Default is 1
+        :param int limit: Number of entries per page. Default (and max) is
+                          1000
+        :param int prefetch: Pages to request ahead of time. Default is 2
+        :return: Player ratings, in order
+        :rtype: async_generator(dict)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Accepts the same keyword arguments as :py:meth:`top_players`
+        """
+        return _paginate(
+            lambda n: self.top_players(
+                rank_field, rating, page_no=n, limit=limit, **kwargs),
+            page_no, limit, prefetch)
+
+    def iter_clans(self, page_no=1, limit=100, prefetch=2, **kwargs):
+        r"""
+        Iterate over clans, page by page
+
+        The next ``prefetch`` pages are requested concurrently while the
+        current one is being read. Iteration stops after the last page.
+
+        :param int page_no: Page to start from. Default is 1
+        :param int limit: Number of clans per page. Default (and max) is 100
+        :param int prefetch: Pages to request ahead of time. Default is 2
+        :return: Clans, in order
+        :rtype: async_generator(dict)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Accepts the same keyword arguments as :py:meth:`clan_search`
+        """
+        return _paginate(
+            lambda n: self.clan_search(page_no=n, limit=limit, **kwargs),
+            page_no, limit, prefetch)
+
+
+async def _paginate(request, page_no, limit, prefetch):
+    r"""
+    Yield every entry of a paginated listing, starting from ``page_no``, with
+    up to ``prefetch`` further pages requested ahead of time
+    """
+    pending = deque(asyncio.ensure_future(request(n))
+                    for n in range(page_no, page_no + prefetch + 1))
+    try:
+        while True:
+            page = await pending.popleft()
+            for entry in page.data:
+                yield entry
+            if _last_page(page, page_no, limit):
+                return
+            page_no += 1
+            pending.append(asyncio.ensure_future(request(page_no + prefetch)))
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,6 +1,8 @@
 from datetime import datetime
+import re
+from threading import Lock
 import requests
-from .utils import validate_realm, automerge, _join_param, _not_iter, chunker
+from .utils import validate_realm, automerge, _join_param, _not_iter
 
 try:
     range = xrange
@@ -10,6 +12,34 @@ except NameError:
 #: Base URL for WG's Console API
 api_url = 'https://api-{}-console.worldoftanks.com/wotx/'
 
+
+def _get(endpoint, params, api_realm='xbox', timeout=10, session=None):
+    r"""
+    Send a request to an API endpoint and wrap the result
+
+    :param str endpoint: Path of the endpoint, relative to :py:data:`api_url`
+    :param dict params: Query parameters
+    :param str api_realm: Platform API. "xbox" or "ps4"
+    :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. Falls back
+                    to :py:func:`requests.get` if omitted. Transports that
+                    define a ``fetch`` method (such as
+                    :py:class:`~.AsyncWOTXTransport`) are handed the request
+                    as-is, and their result is returned unchanged
+    :type session: requests.Session
+    :return: API response
+    :rtype: WOTXResponse
+    :raises WOTXResponseError: If the API returns with an "error" field
+    """
+    url = api_url.format(api_realm) + endpoint
+    fetch = getattr(session, 'fetch', None)
+    if fetch is not None:
+        return fetch(url, params, timeout)
+    if session is None:
+        session = requests
+    return WOTXResponse(session.get(url, params=params, timeout=timeout))
+
+
 # #: Type of data returned by each API requests
 # returns = {
 #     'player_search': list,
@@ -31,7 +61,7 @@ api_url = 'https://api-{}-console.worldoftanks.com/wotx/'
 
 @validate_realm
 def player_search(search, application_id, fields=None, limit=None, stype=None,
-                  language='en', api_realm='xbox', timeout=10):
+                  language='en', api_realm='xbox', timeout=10, session=None):
     r"""
     Search for a player by name
 
@@ -54,13 +84,16 @@ def player_search(search, application_id, fields=None, limit=None, stype=None,
                        length: 1 character. Case-insensitive
 
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'account/list/',
-        params={
+    return _get(
+        'account/list/',
+        {
             'search': search,
             'application_id': application_id,
             'fields': _join_param(fields),
@@ -68,13 +101,14 @@ def player_search(search, application_id, fields=None, limit=None, stype=None,
             'type': stype,
             'limit': limit
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('account_id', 100, 0)
 def player_data(account_id, application_id, access_token=None,
-                fields=None, language='en', api_realm='xbox', timeout=10):
+                fields=None, language='en', api_realm='xbox', timeout=10,
+                session=None):
     r"""
     Retrieve information on one or more players, including statistics. Private
     data requires an access token from a valid, active login.
@@ -89,26 +123,29 @@ def player_data(account_id, application_id, access_token=None,
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'account/info/',
-        params={
+    return _get(
+        'account/info/',
+        {
             'account_id': _join_param(account_id),
             'application_id': application_id,
             'access_token': access_token,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('account_id', 100, 0)
 def player_achievements(account_id, application_id, fields=None, language='en',
-                        api_realm='xbox', timeout=10):
+                        api_realm='xbox', timeout=10, session=None):
     r"""
     View player's achievements, such as mastery badges and battle commendations
 
@@ -120,24 +157,28 @@ def player_achievements(account_id, application_id, fields=None, language='en',
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'account/achievements/',
-        params={
+    return _get(
+        'account/achievements/',
+        {
             'account_id': _join_param(account_id),
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('uid', 100, 0)
-def player_data_uid(uid, application_id, api_realm='xbox', timeout=10):
+def player_data_uid(uid, application_id, api_realm='xbox', timeout=10,
+                    session=None):
     r"""
     Retrieve player info using Microsoft XUID or PlayStation PSNID.
 
@@ -148,26 +189,29 @@ def player_data_uid(uid, application_id, api_realm='xbox', timeout=10):
     :param str application_id: Your application key (generated by WG)
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
     if api_realm.lower == 'xbox':
-        return WOTXResponse(requests.get(
-            api_url.format(api_realm) + 'account/xuidinfo/',
-            params={
+        return _get(
+            'account/xuidinfo/',
+            {
                 'xuid': uid,
                 'application_id': application_id
             },
-            timeout=timeout))
+            api_realm, timeout, session)
     else:
-        return WOTXResponse(requests.get(
-            api_url.format(api_realm) + 'account/psninfo/',
-            params={
+        return _get(
+            'account/psninfo/',
+            {
                 'psnid': _join_param(uid),
                 'application_id': application_id
             },
-            timeout=timeout))
+            api_realm, timeout, session)
 
 
 # Authentication
@@ -176,7 +220,7 @@ def player_data_uid(uid, application_id, api_realm='xbox', timeout=10):
 @validate_realm
 def player_sign_in(application_id, display=None, expires_at=None,
                    nofollow=None, redirect_uri=None, language='en',
-                   api_realm='xbox', timeout=10):
+                   api_realm='xbox', timeout=10, session=None):
     r"""
     Log in a player, receiving an access token once completed successfully.
 
@@ -196,13 +240,16 @@ def player_sign_in(application_id, display=None, expires_at=None,
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'auth/login/',
-        params={
+    return _get(
+        'auth/login/',
+        {
             'application_id': application_id,
             'display': display,
             'expires_at': expires_at,
@@ -210,13 +257,13 @@ def player_sign_in(application_id, display=None, expires_at=None,
             'redirect_uri': redirect_uri,
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 # TODO: Accept `datetime` object for `expires_at`
 @validate_realm
 def extend_player_sign_in(access_token, application_id, expires_at=None,
-                          api_realm='xbox', timeout=10):
+                          api_realm='xbox', timeout=10, session=None):
     r"""
     Extend the active session of a user when the current session is about to
     expire
@@ -227,23 +274,26 @@ def extend_player_sign_in(access_token, application_id, expires_at=None,
                            expiration time is 2 weeks
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'auth/prolongate/',
-        params={
+    return _get(
+        'auth/prolongate/',
+        {
             'access_token': access_token,
             'application_id': application_id,
             'expires_at': expires_at
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 def player_sign_out(access_token, application_id,
-                    api_realm='xbox', timeout=10):
+                    api_realm='xbox', timeout=10, session=None):
     r"""
     Terminate the user's active session. Once successful, the access token will
     no longer be valid
@@ -252,24 +302,28 @@ def player_sign_out(access_token, application_id,
     :param str application_id: Your application key (generated by WG)
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'auth/logout/',
-        params={
+    return _get(
+        'auth/logout/',
+        {
             'access_token': access_token,
             'application_id': application_id
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 # Clans
 
 @validate_realm
 def clan_search(application_id, fields=None, limit=None, page_no=None,
-                search=None, language='en', api_realm='xbox', timeout=10):
+                search=None, language='en', api_realm='xbox', timeout=10,
+                session=None):
     r"""
     Search for clan(s)
 
@@ -286,26 +340,31 @@ def clan_search(application_id, fields=None, limit=None, page_no=None,
     :param str language: Localized language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(api_url.format(api_realm) + 'clans/list/',
-                                     params={
-        'application_id': application_id,
-        'fields': _join_param(fields),
-        'limit': limit,
-        'page_no': page_no,
-        'search': search,
-        'langauge': language
-    },
-        timeout=timeout))
+    return _get(
+        'clans/list/',
+        {
+            'application_id': application_id,
+            'fields': _join_param(fields),
+            'limit': limit,
+            'page_no': page_no,
+            'search': search,
+            'langauge': language
+        },
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('clan_id', 100, 0)
 def clan_details(clan_id, application_id, extra=None,
-                 fields=None, language='en', api_realm='xbox', timeout=10):
+                 fields=None, language='en', api_realm='xbox', timeout=10,
+                 session=None):
     r"""
     Retrieve detailed information on one or more clans.
 
@@ -322,25 +381,30 @@ def clan_details(clan_id, application_id, extra=None,
     :param str language: Localized language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(api_url.format(api_realm) + 'clans/info/',
-                                     params={
-        'clan_id': _join_param(clan_id),
-        'application_id': application_id,
-        'extra': _join_param(extra),
-        'fields': _join_param(fields),
-        'language': language
-    },
-        timeout=timeout))
+    return _get(
+        'clans/info/',
+        {
+            'clan_id': _join_param(clan_id),
+            'application_id': application_id,
+            'extra': _join_param(extra),
+            'fields': _join_param(fields),
+            'language': language
+        },
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('account_id', 100, 0)
 def player_clan_data(account_id, application_id, extra=None,
-                     fields=None, language='en', api_realm='xbox', timeout=10):
+                     fields=None, language='en', api_realm='xbox', timeout=10,
+                     session=None):
     r"""
     Retrieve clan relationship for one or more players
 
@@ -354,25 +418,28 @@ def player_clan_data(account_id, application_id, extra=None,
     :param str language: Localized language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'clans/accountinfo/',
-        params={
+    return _get(
+        'clans/accountinfo/',
+        {
             'account_id': _join_param(account_id),
             'application_id': application_id,
             'extra': _join_param(extra),
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 def clan_glossary(application_id, fields=None, language='en', api_realm='xbox',
-                  timeout=10):
+                  timeout=10, session=None):
     r"""
     Retrieve general information regarding clans (_not_ clan-specific info)
 
@@ -383,25 +450,28 @@ def clan_glossary(application_id, fields=None, language='en', api_realm='xbox',
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'clans/glossary/',
-        params={
+    return _get(
+        'clans/glossary/',
+        {
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 # Tankopedia
 
 @validate_realm
 def crew_info(application_id, fields=None, language='en', api_realm='xbox',
-              timeout=10):
+              timeout=10, session=None):
     r"""
     Retrieve information about crews
 
@@ -412,24 +482,28 @@ def crew_info(application_id, fields=None, language='en', api_realm='xbox',
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/crewroles/',
-        params={
+    return _get(
+        'encyclopedia/crewroles/',
+        {
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('tank_id', 100)
 def vehicle_info(application_id, fields=None, language='en', nation=None,
-                 tank_id=None, tier=None, api_realm='xbox', timeout=10):
+                 tank_id=None, tier=None, api_realm='xbox', timeout=10,
+                 session=None):
     r"""
     Retrieve information on one or more tanks
 
@@ -446,29 +520,32 @@ def vehicle_info(application_id, fields=None, language='en', nation=None,
     :type tier: list(int)
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: Tank information
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/vehicles/',
-        params={
+    return _get(
+        'encyclopedia/vehicles/',
+        {
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language,
             'nation': nation if _not_iter(
-                nation) else ','.join(map(str, nation)),
+            nation) else ','.join(map(str, nation)),
             'tank_id': tank_id if _not_iter(
-                tank_id) else ','.join(map(str, tank_id)),
+            tank_id) else ','.join(map(str, tank_id)),
             'tier': tier if _not_iter(tier) else ','.join(map(str, tier))
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('tank_id', 100, 0)
 def packages_info(tank_id, application_id, fields=None,
-                  language='en', api_realm='xbox', timeout=10):
+                  language='en', api_realm='xbox', timeout=10, session=None):
     r"""
     Retrieve package characteristics and their interdependence
 
@@ -481,25 +558,29 @@ def packages_info(tank_id, application_id, fields=None,
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/vehiclepackages/',
-        params={
+    return _get(
+        'encyclopedia/vehiclepackages/',
+        {
             'tank_id': _join_param(tank_id),
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('tank_id', 100, 0)
 def equipment_consumable_info(tank_id, application_id, fields=None,
-                              language='en', api_realm='xbox', timeout=10):
+                              language='en', api_realm='xbox', timeout=10,
+                              session=None):
     r"""
     Retrieve vehicle equipment and consumables
 
@@ -512,25 +593,28 @@ def equipment_consumable_info(tank_id, application_id, fields=None,
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/vehicleupgrades/',
-        params={
+    return _get(
+        'encyclopedia/vehicleupgrades/',
+        {
             'tank_id': _join_param(tank_id),
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('category', 100)
 def achievement_info(application_id, category=None, fields=None, language='en',
-                     api_realm='xbox', timeout=10):
+                     api_realm='xbox', timeout=10, session=None):
     r"""
     Retrieve list of awards, medals, and ribbons
 
@@ -548,24 +632,27 @@ def achievement_info(application_id, category=None, fields=None, language='en',
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/achievements/',
-        params={
+    return _get(
+        'encyclopedia/achievements/',
+        {
             'application_id': application_id,
             'category': category,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 def tankopedia_info(application_id, fields=None, language='en',
-                    api_realm='xbox', timeout=10):
+                    api_realm='xbox', timeout=10, session=None):
     r"""
     Retrieve information regarding the Tankopeida itself
 
@@ -576,25 +663,29 @@ def tankopedia_info(application_id, fields=None, language='en',
     :param str language: Response language
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'encyclopedia/info/',
-        params={
+    return _get(
+        'encyclopedia/info/',
+        {
             'application_id': application_id,
             'fields': _join_param(fields),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 # Player ratings
 
 @validate_realm
 def types_of_ratings(application_id, fields=None, language='en',
-                     platform=None, api_realm='xbox', timeout=10):
+                     platform=None, api_realm='xbox', timeout=10,
+                     session=None):
     r"""
     Retrieve dictionary of rating periods and ratings details
 
@@ -612,26 +703,29 @@ def types_of_ratings(application_id, fields=None, language='en',
 
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'ratings/types/',
-        params={
+    return _get(
+        'ratings/types/',
+        {
             'application_id': application_id,
             'fields': _join_param(fields),
             'platform': platform,
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('account_id', 100)
 def dates_with_ratings(rating, application_id, account_id=None, fields=None,
                        language='en', platform=None, api_realm='xbox',
-                       timeout=10):
+                       timeout=10, session=None):
     r"""
     Retrieve dates with available rating data
 
@@ -649,13 +743,16 @@ def dates_with_ratings(rating, application_id, account_id=None, fields=None,
 
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'ratings/dates/',
-        params={
+    return _get(
+        'ratings/dates/',
+        {
             'type': rating,
             'application_id': application_id,
             'account_id': account_id,
@@ -663,13 +760,14 @@ def dates_with_ratings(rating, application_id, account_id=None, fields=None,
             'language': language,
             'platform': platform
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 @automerge('account_id', 100, 1)
 def player_ratings(rating, account_id, application_id, date=None, fields=None,
-                   language='en', platform=None, api_realm='xbox', timeout=10):
+                   language='en', platform=None, api_realm='xbox', timeout=10,
+                   session=None):
     r"""
     Retrieve player ratings by specified IDs
 
@@ -691,15 +789,18 @@ def player_ratings(rating, account_id, application_id, date=None, fields=None,
 
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
     if date and isinstance(date, datetime.datetime):
         date = date.isoformat()
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'ratings/accounts/',
-        params={
+    return _get(
+        'ratings/accounts/',
+        {
             'type': rating,
             'account_id': _join_param(account_id),
             'application_id': application_id,
@@ -708,7 +809,7 @@ def player_ratings(rating, account_id, application_id, date=None, fields=None,
             'platform': platform,
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
@@ -716,7 +817,7 @@ def player_ratings(rating, account_id, application_id, date=None, fields=None,
 def adjacent_positions_in_ratings(
         account_id, rank_field, rating, application_id, date=None,
         fields=None, language='en', limit=None, platform=None,
-        api_realm='xbox', timeout=10):
+        api_realm='xbox', timeout=10, session=None):
     r"""
     Retrieve list of adjacent positions in specified rating
 
@@ -740,15 +841,18 @@ def adjacent_positions_in_ratings(
 
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
     if date and isinstance(date, datetime.datetime):
         date = date.isoformat()
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'ratings/neighbors/',
-        params={
+    return _get(
+        'ratings/neighbors/',
+        {
             'account_id': _join_param(account_id),
             'rank_field': rank_field,
             'type': rating,
@@ -759,13 +863,13 @@ def adjacent_positions_in_ratings(
             'limit': limit,
             'platform': platform
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 @validate_realm
 def top_players(rank_field, rating, application_id, date=None, fields=None,
                 language='en', limit=None, page_no=None, platform=None,
-                api_realm='xbox', timeout=10):
+                api_realm='xbox', timeout=10, session=None):
     r"""
     Retrieve the list of top players by specified parameter
 
@@ -792,15 +896,18 @@ def top_players(rank_field, rating, application_id, date=None, fields=None,
 
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
     if date and isinstance(date, datetime.datetime):
         date = date.isoformat()
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'ratings/top/',
-        params={
+    return _get(
+        'ratings/top/',
+        {
             'rank_field': rank_field,
             'type': rating,
             'application_id': application_id,
@@ -811,16 +918,17 @@ def top_players(rank_field, rating, application_id, date=None, fields=None,
             'page_no': page_no,
             'platform': platform
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 # Player's vehicles
 
 
 @validate_realm
-# @automerge('tank_id', 100)
+@automerge('tank_id', 100)
 def player_tank_statistics(account_id, application_id, access_token=None,
                            in_garage=None, fields=None, api_realm='xbox',
-                           language='en', tank_id=None, timeout=10):
+                           language='en', tank_id=None, timeout=10,
+                           session=None):
     r"""
     Retrieve information on all tanks that a player has owned and/or used
 
@@ -838,60 +946,32 @@ def player_tank_statistics(account_id, application_id, access_token=None,
     :param tank_id: Limit statistics to vehicle(s). Max limit is 100
     :type tank_id: list(int)
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    if len(tank_id) > 100:
-        first = None
-        for tanks in chunker(tank_id, 100):
-            if first is None:
-                first = WOTXResponse(requests.get(
-                    api_url.format(api_realm) + 'tanks/stats/',
-                    params={
-                        'account_id': account_id,
-                        'application_id': application_id,
-                        'access_token': access_token,
-                        'in_garage': in_garage,
-                        'fields': _join_param(fields),
-                        'language': language,
-                        'tank_id': _join_param(tanks)
-                    },
-                    timeout=timeout))
-            else:
-                res = WOTXResponse(requests.get(
-                    api_url.format(api_realm) + 'tanks/stats/',
-                    params={
-                        'account_id': account_id,
-                        'application_id': application_id,
-                        'access_token': access_token,
-                        'in_garage': in_garage,
-                        'fields': _join_param(fields),
-                        'language': language,
-                        'tank_id': _join_param(tanks)
-                    },
-                    timeout=timeout))
-                first.data[str(account_id)] += res.data[str(account_id)]
-        return first
-    else:
-        return WOTXResponse(requests.get(
-            api_url.format(api_realm) + 'tanks/stats/',
-            params={
-                'account_id': account_id,
-                'application_id': application_id,
-                'access_token': access_token,
-                'in_garage': in_garage,
-                'fields': _join_param(fields),
-                'language': language,
-                'tank_id': _join_param(tank_id)
-            },
-            timeout=timeout))
+    return _get(
+        'tanks/stats/',
+        {
+            'account_id': account_id,
+            'application_id': application_id,
+            'access_token': access_token,
+            'in_garage': in_garage,
+            'fields': _join_param(fields),
+            'language': language,
+            'tank_id': _join_param(tank_id)
+        },
+        api_realm, timeout, session)
 
 
 @validate_realm
 def player_tank_achievements(account_id, application_id, access_token=None,
                              fields=None, in_garage=None, tank_id=None,
-                             api_realm='xbox', language='en', timeout=10):
+                             api_realm='xbox', language='en', timeout=10,
+                             session=None):
     r"""
     Retrieve players' achievement details
 
@@ -909,13 +989,16 @@ def player_tank_achievements(account_id, application_id, access_token=None,
     :param str api_realm: Platform API. "xbox" or "ps4"
     :param str language: Response language
     :param int timeout: Maximum allowed time to wait for response from servers
+    :param session: Connection pool to send the request through. A new
+                    connection is opened for every call if omitted
+    :type session: requests.Session
     :return: API response
     :rtype: WOTXResponse
     :raises WOTXResponseError: If the API returns with an "error" field
     """
-    return WOTXResponse(requests.get(
-        api_url.format(api_realm) + 'tanks/achievements/',
-        params={
+    return _get(
+        'tanks/achievements/',
+        {
             'account_id': account_id,
             'application_id': application_id,
             'access_token': access_token,
@@ -924,7 +1007,7 @@ def player_tank_achievements(account_id, application_id, access_token=None,
             'tank_id': _join_param(tank_id),
             'language': language
         },
-        timeout=timeout))
+        api_realm, timeout, session)
 
 
 class WOTXResponse(object):
@@ -935,19 +1018,65 @@ class WOTXResponse(object):
     :type data: dict or list
     :ivar meta: Additional metadata, typically just a count of returned values
     :type meta: dict
-    :ivar raw: Response object returned from the :py:mod:`requests` library
-    :type raw: requests.models.Response
+    :ivar raw: Response object returned from the :py:mod:`requests` library,
+               a summary of it, or ``None``, depending on ``keep_raw``
+    :type raw: requests.models.Response or ResponseSummary
     :ivar status: Usually just the message `'ok'`
     :type status: unicode
+
+    :param response: Response returned from the :py:mod:`requests` library
+    :type response: requests.models.Response
+    :param bool lazy: Put off decoding the body until ``data`` or ``meta`` is
+                      first accessed. Errors are still detected (and raised)
+                      right away, from the ``status`` at the start of the body
+    :param keep_raw: What to keep of ``response`` once the body is decoded:
+                     all of it (``True``), a :py:class:`ResponseSummary`
+                     (``'summary'``) or nothing (``False``). The body is no
+                     longer held twice if it is not kept
+    :type keep_raw: bool or str
+    :param decoder: Function decoding the body from bytes, such as one from
+                    :py:func:`~.get_decoder`. Decoded by :py:mod:`requests`
+                    if omitted
+    :raises WOTXResponseError: If the API returns with an "error" field
     """
 
-    def __init__(self, response):
-        rjson = response.json()
-        if 'data' not in rjson:
-            raise WOTXResponseError(rjson, response)
+    __slots__ = ('data', 'meta', 'raw', 'status', '_keep_raw', '_decoder',
+                 '_pending')
+
+    def __init__(self, response, lazy=False, keep_raw=True, decoder=None):
         self.raw = response
-        for key, value in rjson.items():
-            setattr(self, key, value)
+        self._keep_raw = keep_raw
+        self._decoder = decoder
+        self._pending = None
+        if lazy and _peek_status(response.content) == 'ok':
+            self.status = 'ok'
+            # Held while decoding, so that a response shared between threads
+            # is only decoded once
+            self._pending = Lock()
+        else:
+            self._load(self._decode())
+
+    def _decode(self):
+        r"""
+        Decode the raw response's body
+        """
+        if self._decoder is None:
+            return self.raw.json()
+        return self._decoder(self.raw.content)
+
+    def _load(self, rjson):
+        r"""
+        Set the decoded body's fields as attributes, then let go of as much
+        of the raw response as requested
+        """
+        raw = _release(self.raw, self._keep_raw)
+        if 'data' not in rjson:
+            raise WOTXResponseError(rjson, raw)
+        self.raw = raw
+        self.status = rjson.get('status')
+        self.data = rjson['data']
+        if 'meta' in rjson:
+            self.meta = rjson['meta']
 
     def __eq__(self, val):
         return 'ok' == val
@@ -964,6 +1093,19 @@ class WOTXResponse(object):
         return self.data[index]
 
     def __getattr__(self, unknown):
+        if unknown.startswith('_'):
+            raise AttributeError(unknown)
+        pending = self._pending
+        if pending is not None:
+            with pending:
+                if self._pending is pending:
+                    try:
+                        self._load(self._decode())
+                    finally:
+                        self._pending = None
+            return getattr(self, unknown)
+        if unknown in WOTXResponse.__slots__:
+            raise AttributeError(unknown)
         try:
             return getattr(self.data, unknown)
         except AttributeError:
@@ -971,31 +1113,123 @@ class WOTXResponse(object):
                 'This instance does not have the attribute \'{}\''.format(
                     unknown))
 
+    def _select(self, keys):
+        r"""
+        Copy the response, keeping only the given keys of ``data``
+        """
+        data = self.data
+        subset = WOTXResponse.__new__(WOTXResponse)
+        for name in WOTXResponse.__slots__:
+            if hasattr(self, name):
+                setattr(subset, name, getattr(self, name))
+        subset.data = dict((key, data.get(key)) for key in keys)
+        if 'count' in getattr(self, 'meta', {}):
+            subset.meta = dict(self.meta, count=len(subset.data))
+        return subset
+
     def __iadd__(self, object):
-        if isinstance(object, WOTXResponse) and isinstance(
-                object.data, type(self.data)):
-            if isinstance(self.data, dict):
-                self.data.update(object.data)
-            else:
-                self.data += object.data
-            if 'count' in self.meta:
-                self.meta['count'] = len(self.data)
-            if 'total' in self.meta:
-                self.meta['total'] = len(self.data)
-        elif isinstance(object, type(self.data)):
-            if isinstance(self.data, dict):
-                self.data.update(object)
+        return self._extend([object])
+
+    def _extend(self, others):
+        r"""
+        Merge other responses (or bare ``data``) into this one in a single
+        pass, then update ``meta`` once
+        """
+        data = self.data
+        kind = type(data)
+        for other in others:
+            if isinstance(other, WOTXResponse) and isinstance(other.data,
+                                                              kind):
+                other = other.data
+            elif not isinstance(other, kind):
+                raise NotImplementedError
+            if kind is dict:
+                _update(data, other)
             else:
-                self.data += object
-            if 'count' in self.meta:
-                self.meta['count'] = len(self.data)
-            if 'total' in self.meta:
-                self.meta['total'] = len(self.data)
-        else:
-            raise NotImplementedError
+                data.extend(other)
+        meta = getattr(self, 'meta', None) or {}
+        for field in ('count', 'total'):
+            if field in meta:
+                meta[field] = len(data)
         return self
 
 
+class ResponseSummary(object):
+    r"""
+    What is kept of a :py:mod:`requests` response when ``keep_raw`` is
+    ``'summary'``
+
+    :ivar int status_code: HTTP status code
+    :ivar str url: Full URL requested, including query parameters
+    :ivar elapsed: Time between sending the request and receiving the headers
+    :type elapsed: datetime.timedelta
+    """
+
+    __slots__ = ('status_code', 'url', 'elapsed')
+
+    def __init__(self, status_code, url, elapsed):
+        self.status_code = status_code
+        self.url = url
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return '<ResponseSummary [{}] {}>'.format(self.status_code, self.url)
+
+
+def _release(response, keep_raw):
+    r"""
+    Reduce a :py:mod:`requests` response to what ``keep_raw`` asks for
+    """
+    if keep_raw is True or response is None:
+        return response
+    if keep_raw == 'summary':
+        return ResponseSummary(response.status_code, response.url,
+                               response.elapsed)
+    if not keep_raw:
+        return None
+    raise ValueError('keep_raw must be True, False or "summary"')
+
+
+#: Matches the ``status`` field WG places at the start of every response
+_status = re.compile(br'\s*\{\s*"status"\s*:\s*"(\w+)"')
+
+
+def _peek_status(body):
+    r"""
+    Read the status of a response without decoding its entire body
+
+    :param bytes body: Undecoded response body
+    :return: ``'ok'`` or ``'error'``, or ``None`` if the body does not start
+             with the status
+    :rtype: str
+    """
+    match = _status.match(body)
+    if match is None:
+        return None
+    return match.group(1).decode('ascii')
+
+
+def _update(data, other):
+    r"""
+    Merge one response's ``data`` dictionary into another's.
+
+    Keys present in both that hold lists are extended instead of replaced, as
+    happens when a player's vehicles are split across multiple requests. A
+    list is kept over ``None`` from the other response.
+    """
+    extended = {}
+    for key in [key for key in other if key in data]:
+        current = data[key]
+        if isinstance(current, list) and isinstance(other[key], list):
+            current.extend(other[key])
+            extended[key] = current
+        elif isinstance(current, list) and other[key] is None:
+            extended[key] = current
+    data.update(other)
+    if extended:
+        data.update(extended)
+
+
 class WOTXResponseError(Exception):
     r"""
     Error(s) in interaction with WG's API
@@ -1004,8 +1238,9 @@ class WOTXResponseError(Exception):
     :type error: dict
     :ivar message: HTTP response message
     :type message: unicode
-    :ivar raw: Response object returned from the :py:mod:`requests` library
-    :type raw: requests.models.Response
+    :ivar raw: Response object returned from the :py:mod:`requests` library,
+               a summary of it, or ``None``, depending on ``keep_raw``
+    :type raw: requests.models.Response or ResponseSummary
     :ivar status: Ususally just the message `'error'`
     :type status: unicode
     """
@@ -0,0 +1,104 @@
+from threading import Event, Lock
+
+from .utils import _not_iter
+
+
+class RequestBatcher(object):
+    r"""
+    Coalesces lookups of single IDs made from different threads into one
+    request.
+
+    The first lookup for an endpoint waits up to ``window`` seconds for others
+    to join it (or until ``limit`` IDs have been collected), then requests all
+    of them at once. Every caller receives a response holding only the ID it
+    asked for. Lookups are only combined if all of their other parameters
+    match.
+
+    .. note:: If the API rejects the combined request, every caller that was
+       part of it receives the error
+
+    :param float window: Seconds to wait for other lookups to join a request
+    :param int limit: Maximum IDs per request
+    """
+
+    def __init__(self, window=0.01, limit=100):
+        self.window = window
+        self.limit = limit
+        self._pending = {}
+        self._lock = Lock()
+
+    def submit(self, func, ident, application_id, kwargs):
+        r"""
+        Look up an ID, combined with any other lookups for the same endpoint
+        made in the meantime. Lookups of more than one ID, and those sent
+        through a transport with ``batchable`` set to ``False``, are sent
+        right away
+
+        :param func: Endpoint function from :py:mod:`wotconsole.api`
+        :param ident: ID to look up
+        :param str application_id: Your application key (generated by WG)
+        :param dict kwargs: Remaining parameters for the endpoint
+        :return: API response, for the given ID only
+        :rtype: WOTXResponse
+        :raises WOTXResponseError: If the API returns with an "error" field
+        """
+        if not _not_iter(ident) or ident is None or ',' in str(ident) or \
+                not getattr(kwargs.get('session'), 'batchable', True):
+            return func(ident, application_id, **kwargs)
+        key = (func, application_id, tuple(sorted(
+            (name, _freeze(value)) for name, value in kwargs.items())))
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _Batch()
+            batch.add(str(ident))
+            if len(batch.ids) >= self.limit:
+                del self._pending[key]
+                batch.full.set()
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            try:
+                batch.response = func(batch.ids, application_id, **kwargs)
+            except Exception as e:
+                batch.error = e
+            batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        if isinstance(batch.response, dict):
+            return dict((realm, response._select([str(ident)]))
+                        for realm, response in batch.response.items())
+        return batch.response._select([str(ident)])
+
+
+class _Batch(object):
+    r"""
+    IDs collected for a single request, and its eventual outcome
+    """
+
+    def __init__(self):
+        self.ids = []
+        self._seen = set()
+        self.full = Event()
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+    def add(self, ident):
+        if ident not in self._seen:
+            self._seen.add(ident)
+            self.ids.append(ident)
+
+
+def _freeze(value):
+    r"""
+    Make a parameter's value usable as part of a dictionary key
+    """
+    if isinstance(value, (list, set)):
+        return tuple(value)
+    return value
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from threading import Lock
+
+from requests.models import Response
+
+from .api import WOTXResponse
+from .utils import _write
+
+
+class TankopediaCache(object):
+    r"""
+    On-disk cache for endpoints whose data only changes with game updates.
+
+    Responses from :py:func:`~.vehicle_info`, :py:func:`~.crew_info`,
+    :py:func:`~.packages_info`, :py:func:`~.equipment_consumable_info`,
+    :py:func:`~.achievement_info` and :py:func:`~.clan_glossary` are saved
+    to disk, keyed by endpoint and parameters, and served from there until
+    the realm's Tankopedia version (as reported by
+    :py:func:`~.tankopedia_info`) changes. The version is checked at most once
+    every ``check_interval`` seconds, and the result of the check is shared
+    with every process using the same directory.
+
+    :param str path: Directory to save responses in. Created if missing
+    :param int check_interval: Seconds to trust the last version check for
+    """
+
+    #: Endpoints whose responses are cached
+    endpoints = (
+        'clans/glossary/',
+        'encyclopedia/crewroles/',
+        'encyclopedia/vehicles/',
+        'encyclopedia/vehiclepackages/',
+        'encyclopedia/vehicleupgrades/',
+        'encyclopedia/achievements/'
+    )
+
+    #: Endpoint used to check the Tankopedia version
+    version_endpoint = 'encyclopedia/info/'
+
+    def __init__(self, path, check_interval=600):
+        self.path = path
+        self.check_interval = check_interval
+        self._versions = {}
+        self._lock = Lock()
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def covers(self, url):
+        r"""
+        Check if responses from an endpoint are cached
+
+        :param str url: Full URL of the endpoint
+        :rtype: bool
+        """
+        return url.endswith(self.endpoints)
+
+    def version_request(self, url, params):
+        r"""
+        Build the request needed to check the Tankopedia version, if the last
+        check for the endpoint's realm is out of date
+
+        :param str url: Full URL of a cached endpoint
+        :param dict params: Query parameters sent to the cached endpoint
+        :return: URL and parameters for :py:func:`~.tankopedia_info`, or
+                 ``None`` if the version does not need to be checked
+        :rtype: tuple(str, dict)
+        """
+        base = _base(url)
+        version = self._version(base)
+        if version and time.time() - version['checked'] < self.check_interval:
+            return None
+        return base + self.version_endpoint, {
+            'application_id': params.get('application_id'),
+            'fields': 'game_version,tanks_updated_at'
+        }
+
+    def update_version(self, url, info):
+        r"""
+        Record the Tankopedia version for the endpoint's realm, dropping all
+        saved responses if it has changed
+
+        :param str url: Full URL of a cached endpoint
+        :param info: Response from :py:func:`~.tankopedia_info`
+        :type info: WOTXResponse
+        """
+        base = _base(url)
+        stamp = _digest(json.dumps([info.data.get('game_version'),
+                                    info.data.get('tanks_updated_at')]))
+        previous = self._version(base)
+        version = {'stamp': stamp, 'checked': time.time()}
+        _write(os.path.join(self._realm_dir(base), 'version.json'),
+               json.dumps(version).encode('utf-8'))
+        with self._lock:
+            self._versions[base] = version
+        if previous and previous['stamp'] != stamp:
+            shutil.rmtree(os.path.join(self._realm_dir(base),
+                                       previous['stamp']), True)
+
+    def load(self, url, params, **options):
+        r"""
+        Retrieve a saved response
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters
+        :return: Saved API response, or ``None`` if there is none
+        :rtype: WOTXResponse
+
+        Remaining keyword arguments (``lazy``, ``keep_raw`` and ``decoder``)
+        are passed on to :py:class:`~.WOTXResponse`
+        """
+        path = self._entry(url, params)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            body = f.read()
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = body
+        return WOTXResponse(response, **options)
+
+    def save(self, url, params, response):
+        r"""
+        Save a response to disk
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters
+        :param response: API response to save
+        :type response: WOTXResponse
+        """
+        path = self._entry(url, params)
+        if path is not None:
+            _write(path, _body(response))
+
+    def clear(self):
+        r"""
+        Drop every saved response and version check
+        """
+        with self._lock:
+            self._versions.clear()
+        for name in os.listdir(self.path):
+            shutil.rmtree(os.path.join(self.path, name), True)
+
+    def _realm_dir(self, base):
+        return os.path.join(self.path, _digest(base))
+
+    def _version(self, base):
+        with self._lock:
+            version = self._versions.get(base)
+        if version is not None:
+            return version
+        try:
+            with open(os.path.join(self._realm_dir(base), 'version.json'),
+                      'rb') as f:
+                version = json.loads(f.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return None
+        with self._lock:
+            self._versions[base] = version
+        return version
+
+    def _entry(self, url, params):
+        base = _base(url)
+        version = self._version(base)
+        if version is None:
+            return None
+        key = _digest(url[len(base):] + '?' + _normalize(params))
+        return os.path.join(self._realm_dir(base), version['stamp'],
+                            key + '.json')
+
+    def fetch(self, url, params, timeout, send, **options):
+        r"""
+        Serve a request from the cache, sending it (and saving the response)
+        only if it has not been seen for the current Tankopedia version
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters
+        :param int timeout: Maximum allowed time to wait for response from
+                            servers
+        :param send: Function sending a request when needed, called with the
+                     same arguments
+        :return: API response
+        :rtype: WOTXResponse
+
+        Remaining keyword arguments are passed on to :py:meth:`load`
+        """
+        check = self.version_request(url, params)
+        if check is not None:
+            self.update_version(url, send(check[0], check[1], timeout))
+        response = self.load(url, params, **options)
+        if response is None:
+            response = send(url, params, timeout)
+            self.save(url, params, response)
+        return response
+
+
+def _base(url):
+    r"""
+    Strip the endpoint path from a URL, leaving the realm's API root
+    """
+    for endpoint in TankopediaCache.endpoints + (
+            TankopediaCache.version_endpoint, ):
+        if url.endswith(endpoint):
+            return url[:-len(endpoint)]
+    return url
+
+
+def _normalize(params):
+    r"""
+    Serialize query parameters so that equivalent requests share a key.
+    Unset parameters and credentials are left out, and comma-separated lists
+    are sorted
+    """
+    items = []
+    for key, value in sorted(params.items()):
+        if value is None or key in ('application_id', 'access_token'):
+            continue
+        if not isinstance(value, (str, int, float)):
+            value = ','.join(map(str, value))
+        items.append(key + '=' + ','.join(sorted(str(value).split(','))))
+    return '&'.join(items)
+
+
+def _body(response):
+    r"""
+    Body of a response as sent by the API, re-encoded from the decoded fields
+    if the raw response was not kept
+    """
+    raw = response.raw
+    if isinstance(raw, Response) and raw.content:
+        return raw.content
+    body = {'status': response.status, 'data': response.data}
+    if hasattr(response, 'meta'):
+        body['meta'] = response.meta
+    return json.dumps(body).encode('utf-8')
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
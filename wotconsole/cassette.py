@@ -0,0 +1,187 @@
+r"""
+Recording of API traffic, and offline replay of it
+"""
+
+import base64
+from io import BytesIO
+import json
+import os
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .cache import _digest, _normalize
+from .utils import _write
+
+try:
+    from urllib.parse import parse_qsl, urlsplit
+except ImportError:
+    from urlparse import parse_qsl, urlsplit
+
+
+#: Headers describing the body as sent, rather than as recorded
+_body_headers = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class Cassette(object):
+    r"""
+    Store of recorded requests and responses, for using the API offline.
+
+    In "record" mode, every request is sent to the API and its response
+    (status, headers and body) is saved. In "replay" mode, nothing is sent:
+    responses are served from the recordings instead, optionally after
+    ``latency`` seconds to mimic the trip to the servers.
+
+    Requests are matched on their endpoint and parameters, not counting the
+    application ID or access token, so recordings made with one key can be
+    replayed with another.
+
+    .. code:: python
+
+        >>> with WOTXSession('my-key',
+        ...                  cassette=Cassette('fixtures', 'record')) as sess:
+        ...     sess.player_data(range(1000, 1200))
+        >>> offline = WOTXSession(cassette=Cassette('fixtures'))
+        >>> offline.player_data(range(1000, 1200))  # no network needed
+
+    :param str path: Directory to keep recordings in. Created if missing
+    :param str mode: "record" or "replay"
+    :param float latency: Seconds to wait before serving each replayed
+                          response
+    :raises ValueError: If the mode is not valid
+    """
+
+    def __init__(self, path, mode='replay', latency=0):
+        if mode not in ('record', 'replay'):
+            raise ValueError('Parameter "mode" is invalid!')
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def adapter(self, **kwargs):
+        r"""
+        Create a transport adapter recording or replaying requests, depending
+        on the mode
+
+        :return: Adapter to mount on a :py:class:`requests.Session`
+        :rtype: requests.adapters.HTTPAdapter
+
+        Keyword arguments are passed on to the adapter
+        """
+        if self.mode == 'record':
+            return RecordingAdapter(self, **kwargs)
+        return ReplayAdapter(self, **kwargs)
+
+    def load(self, url, method='GET'):
+        r"""
+        Retrieve a recording
+
+        :param str url: Full URL requested, including query parameters
+        :param str method: HTTP method
+        :return: Recorded status, headers and body, or ``None`` if the request
+                 was never recorded
+        :rtype: dict
+        """
+        path = self._entry(url, method)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def save(self, url, response, method='GET'):
+        r"""
+        Record a response
+
+        :param str url: Full URL requested, including query parameters
+        :param response: Response received from the API
+        :type response: requests.Response
+        :param str method: HTTP method
+        """
+        body = response.content
+        try:
+            entry = {'body': body.decode('utf-8')}
+        except UnicodeDecodeError:
+            entry = {'body_base64': base64.b64encode(body).decode('ascii')}
+        entry.update({
+            'method': method,
+            'url': url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': dict((key, value) for key, value in
+                            response.headers.items()
+                            if key.lower() not in _body_headers)
+        })
+        _write(self._entry(url, method), json.dumps(
+            entry, indent=2, sort_keys=True).encode('utf-8'))
+
+    def _entry(self, url, method):
+        parts = urlsplit(url)
+        key = '{} {}{}?{}'.format(method, parts.netloc, parts.path,
+                                  _normalize(dict(parse_qsl(parts.query))))
+        return os.path.join(self.path, _digest(key) + '.json')
+
+
+class RecordingAdapter(HTTPAdapter):
+    r"""
+    Transport adapter sending requests as usual and saving every response to
+    a :py:class:`Cassette`
+
+    :param cassette: Where to save responses
+    :type cassette: Cassette
+
+    Remaining keyword arguments are passed on to
+    :py:class:`requests.adapters.HTTPAdapter`
+    """
+
+    def __init__(self, cassette, **kwargs):
+        super(RecordingAdapter, self).__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super(RecordingAdapter, self).send(request, **kwargs)
+        self.cassette.save(request.url, response, request.method)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    r"""
+    Transport adapter serving responses from a :py:class:`Cassette` without
+    touching the network
+
+    :param cassette: Where to find responses
+    :type cassette: Cassette
+
+    Remaining keyword arguments are passed on to
+    :py:class:`requests.adapters.HTTPAdapter`
+    """
+
+    def __init__(self, cassette, **kwargs):
+        super(ReplayAdapter, self).__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.load(request.url, request.method)
+        if entry is None:
+            raise LookupError(
+                'No recording of {} {}'.format(request.method, request.url))
+        if self.cassette.latency:
+            time.sleep(self.cassette.latency)
+        if 'body_base64' in entry:
+            body = base64.b64decode(entry['body_base64'])
+        else:
+            body = entry['body'].encode('utf-8')
+        response = Response()
+        response.status_code = entry['status_code']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
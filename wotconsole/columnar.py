@@ -0,0 +1,91 @@
+r"""
+Compact, column-oriented storage of vehicle statistics using NumPy
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def tank_statistics_columns(response, fields=None):
+    r"""
+    Convert a :py:func:`~.player_tank_statistics` response into one NumPy
+    structured array per player, with a row per vehicle and a fixed-width
+    column per numeric statistic.
+
+    Nested statistics are flattened into dotted column names, such as
+    ``all.battles``. Values missing from a vehicle's statistics are stored as
+    0. Non-numeric values are left out.
+
+    .. code:: python
+
+        >>> stats = tank_statistics_columns(
+        ...     sess.player_tank_statistics(2631240))
+        >>> tanks = stats['2631240']
+        >>> tanks['tank_id'][tanks['all.battles'].argmax()]
+        1
+
+    :param response: API response from :py:func:`~.player_tank_statistics`
+    :type response: WOTXResponse
+    :param fields: Columns to keep and, optionally, their NumPy types. Pass
+                   the same columns to get arrays that can be concatenated
+                   across players. By default, every numeric statistic found
+                   is kept, typed as 64-bit integers or floats
+    :type fields: list(str) or dict(str, str)
+    :return: Statistics for each player, or ``None`` for players without any
+    :rtype: dict(str, numpy.ndarray)
+    :raises ImportError: If NumPy is not installed
+    """
+    if numpy is None:
+        raise ImportError(
+            'tank_statistics_columns requires the "numpy" package')
+    columns = {}
+    for account_id, tanks in response.data.items():
+        if tanks is None:
+            columns[account_id] = None
+            continue
+        rows = [_flatten(tank) for tank in tanks]
+        dtype = _dtype(rows, fields)
+        array = numpy.zeros(len(rows), dtype=dtype)
+        for name in array.dtype.names:
+            array[name] = [row.get(name, 0) for row in rows]
+        columns[account_id] = array
+    return columns
+
+
+def _flatten(record, prefix=''):
+    r"""
+    Flatten nested statistics into a single dictionary of numeric values
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix + key + '.'))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def _dtype(rows, fields):
+    r"""
+    Build the structured type for a set of rows. Columns are typed as floats
+    if any row holds a fractional value, otherwise as integers
+    """
+    if isinstance(fields, dict):
+        return [(str(name), kind) for name, kind in fields.items()]
+    if fields is None:
+        names = set()
+        for row in rows:
+            names.update(row)
+        names = sorted(names)
+        if 'tank_id' in names:
+            names.remove('tank_id')
+            names.insert(0, 'tank_id')
+    else:
+        names = fields
+    dtype = []
+    for name in names:
+        fractional = any(isinstance(row.get(name), float) for row in rows)
+        dtype.append((str(name), 'f8' if fractional else 'i8'))
+    return dtype
@@ -0,0 +1,53 @@
+r"""
+Compressed transfer of response bodies
+"""
+
+try:
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:
+    ACCEPT_ENCODING = 'gzip,deflate'
+
+#: Encodings that may be asked for, in order of preference
+encodings = ('zstd', 'br', 'gzip', 'deflate')
+
+
+def available():
+    r"""
+    Encodings that :py:mod:`requests` can decode with the packages installed.
+    gzip and deflate are always available; brotli needs the ``brotli``
+    package and zstd needs ``zstandard``
+
+    :rtype: list(str)
+    """
+    names = ACCEPT_ENCODING.replace(' ', '').split(',')
+    return [name for name in encodings if name in names]
+
+
+def accept_encoding(compression='auto', supported=None):
+    r"""
+    Value of the ``Accept-Encoding`` header asking for compressed responses
+
+    :param compression: "auto" for every encoding that can be decoded,
+                        ``None`` or ``False`` for uncompressed responses, or
+                        the encodings to ask for, such as ``['gzip']``
+    :type compression: str or list(str)
+    :param supported: Encodings that can be decoded. Those of
+                      :py:func:`available` by default
+    :type supported: list(str)
+    :rtype: str
+    :raises ValueError: If an encoding cannot be decoded with the packages
+                        installed
+    """
+    if supported is None:
+        supported = available()
+    if not compression:
+        return 'identity'
+    if compression == 'auto':
+        return ', '.join(supported)
+    if isinstance(compression, str):
+        compression = [compression]
+    for name in compression:
+        if name not in supported and name != 'identity':
+            raise ValueError(
+                'Responses encoded with "{}" cannot be decoded'.format(name))
+    return ', '.join(compression)
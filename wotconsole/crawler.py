@@ -0,0 +1,134 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import json
+import os
+
+from .utils import _write, chunker
+
+
+class Crawler(object):
+    r"""
+    Resumable bulk lookup of IDs, such as every account in a realm.
+
+    IDs are split into batches that are requested concurrently through a
+    session (and therefore under its rate limit), and each batch's response is
+    handed to ``sink`` in order. After every ``checkpoint_every`` batches, the
+    number of batches delivered so far is saved to ``checkpoint``. If the
+    crawl is interrupted, running it again with the same IDs skips the batches
+    that were already delivered.
+
+    .. note:: Batches delivered after the last checkpoint are delivered again
+       when resuming, so sinks should tolerate seeing a batch twice
+
+    :param session: Session to send requests through
+    :type session: WOTXSession
+    :param sink: Called with the :py:class:`~.WOTXResponse` of each batch
+    :param str checkpoint: File to save progress to. Progress is not saved if
+                           omitted
+    :param str method: Name of the session's method to call with each batch.
+                       Default is "player_data"
+    :param int batch_size: IDs per request. Default (and max) is 100
+    :param int max_workers: Batches to request at once
+    :param int checkpoint_every: Batches to deliver between checkpoints
+    """
+
+    def __init__(self, session, sink, checkpoint=None, method='player_data',
+                 batch_size=100, max_workers=4, checkpoint_every=10):
+        self.session = session
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.method = method
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+
+    def completed(self):
+        r"""
+        Number of batches delivered according to the checkpoint
+
+        :rtype: int
+        """
+        if self.checkpoint is None or not os.path.isfile(self.checkpoint):
+            return 0
+        with open(self.checkpoint, 'rb') as f:
+            state = json.loads(f.read().decode('utf-8'))
+        if state['batch_size'] != self.batch_size:
+            raise ValueError(
+                'Checkpoint was saved with a batch size of {}'.format(
+                    state['batch_size']))
+        return state['batches']
+
+    def save(self, batches):
+        r"""
+        Record the number of batches delivered
+
+        :param int batches: Batches delivered since the crawl began
+        """
+        if self.checkpoint is not None:
+            _write(self.checkpoint, json.dumps({
+                'batches': batches,
+                'batch_size': self.batch_size
+            }).encode('utf-8'))
+
+    def crawl(self, ids, **kwargs):
+        r"""
+        Look up every ID, resuming from the checkpoint if there is one
+
+        :param ids: IDs to look up. Must produce the same IDs in the same order
+                    each time the crawl is resumed, as a ``range`` or a sorted
+                    query would
+        :type ids: iterable
+        :return: Total number of batches delivered
+        :rtype: int
+        :raises WOTXResponseError: If the API returns with an "error" field.
+                                   Progress up to the failed batch is saved
+
+        Remaining keyword arguments are passed on to the session's method
+        """
+        request = getattr(self.session, self.method)
+        done = self.completed()
+        batches = islice(chunker(ids, self.batch_size), done, None)
+
+        def fetch(batch):
+            return request(batch, **kwargs)
+
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            pending = deque()
+            try:
+                for batch in batches:
+                    pending.append(pool.submit(fetch, batch))
+                    if len(pending) < self.max_workers * 2:
+                        continue
+                    done = self._deliver(pending.popleft(), done)
+                while pending:
+                    done = self._deliver(pending.popleft(), done)
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.save(done)
+        return done
+
+    def _deliver(self, future, done):
+        self.sink(future.result())
+        done += 1
+        if done % self.checkpoint_every == 0:
+            self.save(done)
+        return done
+
+
+class JSONLinesSink(object):
+    r"""
+    Crawler sink appending every entry of each response's ``data`` to a file,
+    one JSON object per line
+
+    :param str path: File to append to
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, response):
+        with open(self.path, 'a') as f:
+            for key, value in response.data.items():
+                f.write(json.dumps({'id': key, 'data': value}) + '\n')
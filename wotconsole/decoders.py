@@ -0,0 +1,60 @@
+r"""
+JSON decoders for response bodies.
+
+Each decoder takes the undecoded body of a response, as bytes, and returns
+the decoded JSON document.
+"""
+
+import json
+
+
+def stdlib_decoder(body):
+    r"""
+    Decode a response body with the standard library's :py:mod:`json`
+
+    :param bytes body: Undecoded response body
+    :return: Decoded JSON document
+    :rtype: dict
+    """
+    return json.loads(body.decode('utf-8'))
+
+
+#: Third-party decoders, fastest first, with the function each one offers
+_third_party = (
+    ('orjson', 'loads'),
+    ('ujson', 'loads'),
+    ('simdjson', 'loads')
+)
+
+
+def get_decoder(name='auto'):
+    r"""
+    Look up a JSON decoder by name
+
+    :param name: "orjson", "ujson", "simdjson" or "json" (the standard
+                 library). "auto" picks the fastest one installed. Callables
+                 are returned untouched
+    :type name: str or callable
+    :return: Function decoding a response body from bytes
+    :raises ImportError: If the named decoder is not installed
+    :raises ValueError: If the name is not a known decoder
+    """
+    if callable(name):
+        return name
+    if name == 'json':
+        return stdlib_decoder
+    if name == 'auto':
+        for module, func in _third_party:
+            try:
+                return getattr(__import__(module), func)
+            except ImportError:
+                continue
+        return stdlib_decoder
+    for module, func in _third_party:
+        if module == name:
+            try:
+                return getattr(__import__(module), func)
+            except ImportError:
+                raise ImportError(
+                    'The "{}" decoder is not installed'.format(name))
+    raise ValueError('Unknown decoder "{}"'.format(name))
@@ -0,0 +1,219 @@
+from threading import Lock
+
+from .api import WOTXResponseError
+
+
+class Metrics(object):
+    r"""
+    Counters and latency histograms for the requests sent by a transport.
+
+    For every endpoint, records the number of requests, the bytes received
+    (both as sent over the network and once decompressed), the encodings
+    responses came in, how long each request took, which errors came back (by
+    WG's error message, or the exception's name for failures without one) and
+    how many requests were retried. For methods whose parameters had to be
+    split into several requests, records how many chunks each call needed.
+
+    Read the counters with :py:meth:`snapshot`, or receive every event as it
+    happens through ``callback``. Safe to share between threads and
+    transports.
+
+    .. code:: python
+
+        >>> sess = WOTXSession('my-key', metrics=True)
+        >>> sess.player_data(range(1000, 1300))
+        >>> sess.metrics.snapshot()['endpoints']['account/info/']['requests']
+        3
+
+    :param buckets: Upper bounds of the latency histogram's buckets, in
+                    seconds
+    :type buckets: list(float)
+    :param callback: Called with a dictionary describing every request,
+                     retry and split call. Called from the thread that sent
+                     the request, so it should be quick
+    """
+
+    #: Default upper bounds of the latency histogram's buckets, in seconds
+    buckets = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets=None, callback=None):
+        if buckets is not None:
+            self.buckets = tuple(sorted(buckets))
+        self.callback = callback
+        self._endpoints = {}
+        self._splits = {}
+        self._lock = Lock()
+
+    def record(self, endpoint, seconds, size=0, error=None, wire_size=None,
+               encoding=None):
+        r"""
+        Record a request
+
+        :param str endpoint: Path of the endpoint, or its full URL
+        :param float seconds: Time taken by the request
+        :param int size: Bytes received, once decompressed
+        :param Exception error: Error raised by the request, if any
+        :param int wire_size: Bytes received over the network. The same as
+                              ``size`` if omitted
+        :param str encoding: Content encoding of the response, if compressed
+        """
+        endpoint = _endpoint(endpoint)
+        label = None if error is None else _label(error)
+        if wire_size is None:
+            wire_size = size
+        encoding = encoding or 'identity'
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats['requests'] += 1
+            stats['bytes'] += size
+            stats['wire_bytes'] += wire_size
+            encodings = stats['encodings']
+            encodings[encoding] = encodings.get(encoding, 0) + 1
+            if label is not None:
+                stats['errors'][label] = stats['errors'].get(label, 0) + 1
+            latency = stats['latency']
+            latency['count'] += 1
+            latency['sum'] += seconds
+            latency['max'] = max(latency['max'], seconds)
+            latency['counts'][self._bucket(seconds)] += 1
+        self._emit({'event': 'request', 'endpoint': endpoint,
+                    'seconds': seconds, 'bytes': size,
+                    'wire_bytes': wire_size, 'encoding': encoding,
+                    'error': label})
+
+    def retried(self, endpoint, error):
+        r"""
+        Record that a failed request is about to be sent again
+
+        :param str endpoint: Path of the endpoint, or its full URL
+        :param Exception error: Error that caused the retry
+        """
+        endpoint = _endpoint(endpoint)
+        with self._lock:
+            self._stats(endpoint)['retries'] += 1
+        self._emit({'event': 'retry', 'endpoint': endpoint,
+                    'error': _label(error)})
+
+    def split(self, method, chunks):
+        r"""
+        Record a call whose parameters were split into several requests
+
+        :param str method: Name of the function called
+        :param int chunks: Number of requests it was split into
+        """
+        with self._lock:
+            stats = self._splits.get(method)
+            if stats is None:
+                stats = self._splits[method] = {
+                    'calls': 0, 'chunks': 0, 'max_chunks': 0}
+            stats['calls'] += 1
+            stats['chunks'] += chunks
+            stats['max_chunks'] = max(stats['max_chunks'], chunks)
+        self._emit({'event': 'split', 'method': method, 'chunks': chunks})
+
+    def snapshot(self):
+        r"""
+        Copy of every counter recorded so far.
+
+        ``endpoints`` maps each endpoint to its ``requests``, ``bytes``
+        (once decompressed), ``wire_bytes`` (as received), ``encodings``
+        (requests counted by content encoding), ``retries``, ``errors``
+        (counted by error) and ``latency``. Latency holds the ``count``,
+        ``sum`` and ``max`` of the request times, and ``buckets``: the number
+        of requests that took up to each bound, in seconds, with slower ones
+        under ``'+Inf'``. ``splits`` maps each method that had to be split to
+        the number of ``calls`` and the total and ``max_chunks`` they were
+        split into.
+
+        :rtype: dict
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._endpoints.items():
+                latency = stats['latency']
+                labels = [str(bound) for bound in self.buckets] + ['+Inf']
+                endpoints[endpoint] = {
+                    'requests': stats['requests'],
+                    'bytes': stats['bytes'],
+                    'wire_bytes': stats['wire_bytes'],
+                    'encodings': dict(stats['encodings']),
+                    'retries': stats['retries'],
+                    'errors': dict(stats['errors']),
+                    'latency': {
+                        'count': latency['count'],
+                        'sum': latency['sum'],
+                        'max': latency['max'],
+                        'buckets': dict(zip(labels, latency['counts']))
+                    }
+                }
+            splits = dict((method, dict(stats))
+                          for method, stats in self._splits.items())
+        return {'endpoints': endpoints, 'splits': splits}
+
+    def reset(self):
+        r"""
+        Drop every counter recorded so far
+        """
+        with self._lock:
+            self._endpoints.clear()
+            self._splits.clear()
+
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {
+                'requests': 0, 'bytes': 0, 'wire_bytes': 0, 'encodings': {},
+                'retries': 0, 'errors': {},
+                'latency': {'count': 0, 'sum': 0.0, 'max': 0.0,
+                            'counts': [0] * (len(self.buckets) + 1)}
+            }
+        return stats
+
+    def _bucket(self, seconds):
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                return index
+        return len(self.buckets)
+
+    def _emit(self, event):
+        if self.callback is not None:
+            self.callback(event)
+
+
+def _endpoint(url):
+    r"""
+    Reduce a full URL to the endpoint's path, such as "account/info/"
+    """
+    return '/'.join(url.split('?')[0].rstrip('/').split('/')[-2:]) + '/'
+
+
+def _label(error):
+    r"""
+    Name an error by WG's error message, or the exception's class
+    """
+    if isinstance(error, WOTXResponseError):
+        return error.error.get('message') or type(error).__name__
+    return type(error).__name__
+
+
+def _method(call):
+    r"""
+    Name of the function behind a chunk of a split request
+    """
+    func = getattr(call, 'func', call)
+    return getattr(func, '__name__', repr(func))
+
+
+def _counted(calls, metrics):
+    r"""
+    Yield the chunks of a split request as they are sent, recording the
+    split once all of them have been
+    """
+    method, chunks = None, 0
+    for call in calls:
+        if method is None:
+            method = _method(call)
+        chunks += 1
+        yield call
+    if metrics is not None and chunks:
+        metrics.split(method, chunks)
@@ -0,0 +1,255 @@
+import sys
+from functools import partial
+from threading import Lock
+
+from .api import WOTXResponse
+
+
+class FieldLearner(object):
+    r"""
+    Learns which fields of the responses to each call site are actually read,
+    so that later calls from the same place in the code ask the API for only
+    those fields.
+
+    The entries of ``data`` in responses it handles are dictionaries that
+    note every value read from them. The first call from a site fetches
+    everything. Later calls pass the fields read so far as ``fields``. If a
+    field that was left out is read, the full response is fetched once to
+    fill it in, and the field is requested from then on. Iterating over an
+    entry, or over any dictionary inside it, counts as reading all of it.
+
+    .. code:: python
+
+        >>> sess = WOTXSession('my-key', learn_fields=True)
+        >>> for ids in batches:
+        ...     for player in sess.player_data(ids).data.values():
+        ...         print(player['nickname'],
+        ...               player['statistics']['all']['wins'])
+        >>> sess.learner.learned()
+        {'player_data at report.py:2': ['nickname', 'statistics.all.wins']}
+
+    .. note:: Calls that pass ``fields`` themselves are left alone, as are
+       streamed calls and calls to several realms at once
+    """
+
+    def __init__(self):
+        self._sites = {}
+        self._lock = Lock()
+
+    def request(self, session, method, call, kwargs):
+        r"""
+        Send a request, asking for the fields learned for its call site and
+        tracking which are read. The call site is the caller of the session
+        method calling this
+
+        :param session: Session the request is sent through
+        :type session: WOTXSession
+        :param str method: Name of the session's method
+        :param call: Sends the request, given keyword arguments
+        :param dict kwargs: Parameters for the request
+        :return: API response
+        :rtype: WOTXResponse
+        """
+        if 'fields' in kwargs or \
+                kwargs.get('session') is not session.transport or \
+                not isinstance(kwargs.get('api_realm'), str):
+            # Passing fields keeps the session from handing the call back
+            return call(fields=None, **kwargs)
+        caller = sys._getframe(2)
+        site = (method, caller.f_code.co_filename, caller.f_lineno)
+        fields = self.fields(site)
+        response = call(fields=fields, **kwargs)
+        if not isinstance(response, WOTXResponse):
+            return response
+        refetch = None
+        if fields is not None:
+            refetch = partial(call, fields=None, **kwargs)
+        _Projection(self, site, response, refetch, fields).track()
+        return response
+
+    def fields(self, site):
+        r"""
+        Fields to request for a call site
+
+        :param tuple site: Method name, file name and line number
+        :return: Fields read so far, or ``None`` for all of them
+        :rtype: list(str)
+        """
+        with self._lock:
+            paths = sorted(self._sites.get(site, ()))
+        if not paths or '' in paths:
+            return None
+        fields = []
+        # Sorted, so every field comes after the fields containing it
+        for path in paths:
+            if not any(path.startswith(field + '.') for field in fields):
+                fields.append(path)
+        return fields
+
+    def learned(self):
+        r"""
+        Fields requested for each call site, or ``None`` where everything is
+        requested
+
+        :rtype: dict
+        """
+        with self._lock:
+            sites = list(self._sites)
+        return dict(('{} at {}:{}'.format(*site), self.fields(site))
+                    for site in sites)
+
+    def reset(self):
+        r"""
+        Forget every field learned so far
+        """
+        with self._lock:
+            self._sites.clear()
+
+    def _use(self, site, path):
+        paths = self._sites.get(site)
+        if paths is None or path not in paths:
+            with self._lock:
+                self._sites.setdefault(site, set()).add(path)
+
+
+class _Projection(object):
+    r"""
+    A tracked response, the fields it was requested with and how to fill in
+    the fields it is missing
+    """
+
+    def __init__(self, learner, site, response, refetch, fields=None):
+        self.learner = learner
+        self.site = site
+        self.response = response
+        self.refetch = refetch
+        self.fields = fields
+        self._lock = Lock()
+
+    def track(self):
+        data = self.response.data
+        if isinstance(data, dict):
+            for key, entry in data.items():
+                data[key] = _track(entry, '', self)
+
+    def use(self, path):
+        self.learner._use(self.site, path)
+
+    def miss(self, path):
+        r"""
+        Note that a field which may have been left out was read, and fetch
+        the full response to fill in the missing fields, once. Fields that
+        were requested are complete, even if the API left them out
+        """
+        self.use(path)
+        if _covered(path, self.fields):
+            return
+        with self._lock:
+            if self.refetch is None:
+                return
+            full = self.refetch().data
+            self.refetch = None
+            data = self.response.data
+            for key, entry in full.items():
+                current = data.get(key)
+                if current is None:
+                    data[key] = _track(entry, '', self)
+                else:
+                    _fill(current, entry, self)
+
+
+class _Tracked(dict):
+    r"""
+    Dictionary noting which of its values are read
+    """
+
+    __slots__ = ('_path', '_projection')
+
+    def __init__(self, items, path, projection):
+        super(_Tracked, self).__init__(items)
+        self._path = path
+        self._projection = projection
+
+    def __getitem__(self, key):
+        path = _join(self._path, key)
+        if not dict.__contains__(self, key):
+            self._projection.miss(path)
+        value = dict.__getitem__(self, key)
+        if not isinstance(value, _Tracked):
+            self._projection.use(path)
+        return value
+
+    def get(self, key, default=None):
+        if not dict.__contains__(self, key):
+            self._projection.miss(_join(self._path, key))
+            return dict.get(self, key, default)
+        return self[key]
+
+    def __contains__(self, key):
+        if not dict.__contains__(self, key):
+            self._projection.miss(_join(self._path, key))
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._projection.miss(self._path)
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._projection.miss(self._path)
+        return dict.keys(self)
+
+    def values(self):
+        self._projection.miss(self._path)
+        return dict.values(self)
+
+    def items(self):
+        self._projection.miss(self._path)
+        return dict.items(self)
+
+    def copy(self):
+        self._projection.miss(self._path)
+        return dict(dict.items(self))
+
+
+def _track(value, path, projection):
+    r"""
+    Copy dictionaries, including those nested in lists, into ones noting
+    which of their values are read
+    """
+    if isinstance(value, dict):
+        return _Tracked(
+            ((key, _track(item, _join(path, key), projection))
+             for key, item in value.items()), path, projection)
+    if isinstance(value, list):
+        return [_track(item, path, projection) for item in value]
+    return value
+
+
+def _fill(current, full, projection):
+    r"""
+    Add the values left out of a tracked entry from the full entry, in place
+    so that dictionaries already handed out see them too
+    """
+    if isinstance(current, _Tracked) and isinstance(full, dict):
+        for key, value in full.items():
+            if dict.__contains__(current, key):
+                _fill(dict.__getitem__(current, key), value, projection)
+            else:
+                dict.__setitem__(current, key, _track(
+                    value, _join(current._path, key), projection))
+    elif isinstance(current, list) and isinstance(full, list) and \
+            len(current) == len(full):
+        for item, value in zip(current, full):
+            _fill(item, value, projection)
+
+
+def _covered(path, fields):
+    r"""
+    Whether a path lies within one of the fields requested
+    """
+    return bool(fields) and any(
+        path == field or path.startswith(field + '.') for field in fields)
+
+
+def _join(path, key):
+    return '{}.{}'.format(path, key) if path else str(key)
@@ -0,0 +1,57 @@
+from threading import Lock
+from time import sleep
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+
+class RateLimiter(object):
+    r"""
+    Client-side token bucket limiting how fast requests are sent.
+
+    WG limits the number of requests each application may send per second and
+    answers with ``REQUEST_LIMIT_EXCEEDED`` when it is exceeded. Each
+    application ID gets its own bucket, holding up to ``burst`` tokens and
+    refilling at ``rate`` tokens per second; every request takes one token,
+    waiting for it if the bucket is empty. Safe to share between threads and
+    transports.
+
+    :param float rate: Requests allowed per second, per application ID
+    :param int burst: Requests that may be sent back-to-back before throttling
+                      kicks in. Defaults to one second's worth of ``rate``
+    """
+
+    def __init__(self, rate=10, burst=None):
+        self.rate = float(rate)
+        self.burst = max(1, int(rate)) if burst is None else burst
+        self._buckets = {}
+        self._lock = Lock()
+
+    def reserve(self, application_id=None):
+        r"""
+        Take a token from an application's bucket without blocking
+
+        :param str application_id: Application key the request is sent with
+        :return: Seconds to wait before the request may be sent
+        :rtype: float
+        """
+        with self._lock:
+            now = monotonic()
+            tokens, updated = self._buckets.get(
+                application_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+            self._buckets[application_id] = (tokens, now)
+        return 0 if tokens >= 0 else -tokens / self.rate
+
+    def acquire(self, application_id=None):
+        r"""
+        Take a token from an application's bucket, sleeping until the request
+        may be sent
+
+        :param str application_id: Application key the request is sent with
+        """
+        wait = self.reserve(application_id)
+        if wait > 0:
+            sleep(wait)
@@ -0,0 +1,93 @@
+import random
+from threading import Lock
+
+import requests
+
+from .api import WOTXResponseError
+
+#: Exceptions raised for failures that are likely to go away on their own
+_transient = (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+try:
+    import asyncio
+    import aiohttp
+    _transient += (aiohttp.ClientError, asyncio.TimeoutError)
+except ImportError:
+    pass
+
+
+class RetryPolicy(object):
+    r"""
+    Decides whether, and when, to send a failed request again.
+
+    Connection errors, timeouts, server errors (HTTP 5xx) and API errors
+    listed in ``codes`` are retried, waiting ``backoff`` seconds before the
+    first retry and twice as long before each one after that, up to
+    ``max_backoff``. With ``jitter``, the wait is a random fraction of that
+    so that requests failing together do not all come back at once. Any other
+    error, such as ``INVALID_ACCOUNT_ID``, is raised right away.
+
+    Each chunk of a split request is retried on its own, so chunks that
+    succeeded are never sent again. Safe to share between threads and
+    transports.
+
+    :param int retries: Retries allowed per request
+    :param float backoff: Seconds to wait before the first retry
+    :param float max_backoff: Longest wait between retries
+    :param bool jitter: Wait for a random fraction of the backoff
+    :param int budget: Retries allowed in total, across every request made
+                       with this policy. Unlimited by default
+    :param codes: API error messages to retry. Default is
+                  ``REQUEST_LIMIT_EXCEEDED`` and ``SOURCE_NOT_AVAILABLE``
+    :type codes: list(str)
+
+    :ivar remaining: Retries left in the budget, or ``None`` if unlimited
+    :type remaining: int
+    """
+
+    #: API errors retried by default
+    codes = ('REQUEST_LIMIT_EXCEEDED', 'SOURCE_NOT_AVAILABLE')
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, jitter=True,
+                 budget=None, codes=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.remaining = budget
+        if codes is not None:
+            self.codes = tuple(codes)
+        self._lock = Lock()
+
+    def retryable(self, error):
+        r"""
+        Check if an error is worth retrying
+
+        :param Exception error: Error raised by the request
+        :rtype: bool
+        """
+        if isinstance(error, WOTXResponseError):
+            return error.error.get('message') in self.codes
+        return isinstance(error, _transient)
+
+    def schedule(self, error, attempt):
+        r"""
+        Decide whether to retry a failed request, taking a retry from the
+        budget if so
+
+        :param Exception error: Error raised by the request
+        :param int attempt: Retries made so far for the request
+        :return: Seconds to wait before retrying, or ``None`` to give up
+        :rtype: float
+        """
+        if attempt >= self.retries or not self.retryable(error):
+            return None
+        with self._lock:
+            if self.remaining is not None:
+                if self.remaining <= 0:
+                    return None
+                self.remaining -= 1
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
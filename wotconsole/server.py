@@ -0,0 +1,724 @@
+r"""
+Local stand-in for WG's Console API, serving deterministic synthetic data.
+
+Run it from the command line, then point :py:data:`wotconsole.api.api_url`
+at it::
+
+    python -m wotconsole.server --port 8080 --players 5000000 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl, urlsplit
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl, urlsplit
+
+#: Tank IDs that synthetic players may own
+_tanks = tuple(range(1, 65536, 128))
+
+#: Statistics kept for every player and tank
+_stats = ('battles', 'wins', 'losses', 'draws', 'damage_dealt',
+          'damage_received', 'frags', 'spotted', 'shots', 'hits',
+          'piercings', 'capture_points', 'dropped_capture_points',
+          'survived_battles', 'xp', 'battle_life_time')
+
+#: Rating categories offered by ``ratings/top/``
+_rank_fields = ('battles_count', 'damage_avg', 'frags_avg', 'global_rating',
+                'wins_ratio', 'xp_avg')
+
+#: Limits on list parameters, and the error raised when they are exceeded
+_limits = {
+    'account_id': 100,
+    'clan_id': 100,
+    'tank_id': 100
+}
+
+
+class StandInServer(object):
+    r"""
+    HTTP server mimicking WG's Console API with synthetic data.
+
+    Players (IDs 1 to ``players``), clans (IDs 1 to ``clans``) and their
+    vehicles are generated from their IDs and ``seed``, so the same ID always
+    returns the same data no matter how many there are. Endpoints take the
+    same paths and parameters as the real API, enforce the same limits of 100
+    IDs per request, and answer with the same error bodies.
+
+    Set :py:data:`wotconsole.api.api_url` to :py:attr:`url` to send every
+    request to the server:
+
+    .. code:: python
+
+        >>> import wotconsole.api
+        >>> server = StandInServer(players=5000000, latency=0.02).start()
+        >>> wotconsole.api.api_url = server.url
+        >>> WOTXSession().player_data(range(1, 301))
+
+    :param str host: Address to listen on
+    :param int port: Port to listen on. A free port is picked if 0
+    :param int players: Number of players
+    :param int clans: Number of clans
+    :param int seed: Varies the generated data
+    :param latency: Seconds to wait before answering each request, or the
+                    lower and upper bounds of a random wait
+    :type latency: float or tuple(float, float)
+    :param float error_rate: Fraction of requests answered with
+                             ``SOURCE_NOT_AVAILABLE``
+    :param float rate_limit: Requests per second allowed for each application
+                             ID before answering with
+                             ``REQUEST_LIMIT_EXCEEDED``. Unlimited by default
+    :param bool compression: Compress response bodies with the encoding the
+                             client prefers out of gzip, deflate and, with
+                             their packages installed, brotli and zstd
+
+    :ivar int requests: Number of requests answered so far
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, players=1000000, clans=10000,
+                 seed=0, latency=0, error_rate=0, rate_limit=None,
+                 compression=True):
+        self.players = players
+        self.clans = clans
+        self.seed = seed
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.compression = compression
+        self.requests = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.stand_in = self
+        self._thread = None
+
+    @property
+    def url(self):
+        r"""
+        Replacement for :py:data:`wotconsole.api.api_url`
+
+        :rtype: str
+        """
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}/{{}}/'.format(host, port)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        r"""
+        Start answering requests from a background thread
+
+        :return: The server itself
+        :rtype: StandInServer
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        r"""
+        Answer requests from the current thread until interrupted
+        """
+        self._httpd.serve_forever()
+
+    def stop(self):
+        r"""
+        Stop answering requests and close the listening socket
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def handle(self, realm, endpoint, params):
+        r"""
+        Answer a request
+
+        :param str realm: Platform API. "xbox" or "ps4"
+        :param str endpoint: Path of the endpoint, such as "account/info/"
+        :param dict params: Query parameters
+        :return: HTTP status code and response body
+        :rtype: tuple(int, dict)
+        """
+        with self._lock:
+            self.requests += 1
+            unlucky = self._random.random() < self.error_rate
+        if not params.get('application_id'):
+            return _error(402, 'APPLICATION_ID_NOT_SPECIFIED',
+                          'application_id')
+        if not self._allow(params['application_id']):
+            return _error(407, 'REQUEST_LIMIT_EXCEEDED')
+        if unlucky:
+            return _error(504, 'SOURCE_NOT_AVAILABLE')
+        method = _endpoints.get(endpoint)
+        if method is None:
+            return _error(404, 'METHOD_NOT_FOUND', 'method')
+        for name, limit in _limits.items():
+            if len(_split(params.get(name))) > limit:
+                return _error(407, name.upper() + '_LIST_LIMIT_EXCEEDED',
+                              name)
+        try:
+            result = method(self, _Realm(self.seed, realm), params)
+        except _MissingParameter as e:
+            return _error(402, e.args[0].upper() + '_NOT_SPECIFIED',
+                          e.args[0])
+        except _InvalidParameter as e:
+            return _error(407, 'INVALID_' + e.args[0].upper(), e.args[0])
+        if isinstance(result, tuple):
+            data, meta = result
+        else:
+            data, meta = result, {'count': len(result)}
+        fields = _split(params.get('fields'))
+        if fields:
+            data = _project(data, fields, endpoint)
+        return 200, {'status': 'ok', 'meta': meta, 'data': data}
+
+    def wait(self):
+        r"""
+        Sleep for the configured latency
+        """
+        latency = self.latency
+        if isinstance(latency, (tuple, list)):
+            with self._lock:
+                latency = self._random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def _allow(self, application_id):
+        if self.rate_limit is None:
+            return True
+        with self._lock:
+            now = time.time()
+            tokens, updated = self._buckets.get(
+                application_id, (self.rate_limit, now))
+            tokens = min(self.rate_limit,
+                         tokens + (now - updated) * self.rate_limit)
+            allowed = tokens >= 1
+            self._buckets[application_id] = (tokens - allowed, now)
+        return allowed
+
+    # Generated records
+
+    def _player(self, realm, account_id):
+        if not 0 < account_id <= self.players:
+            return None
+        rng = realm.random('player', account_id)
+        created_at = rng.randint(1400000000, 1500000000)
+        statistics = _statistics(rng, rng.randint(0, 60000))
+        return {
+            'account_id': account_id,
+            'nickname': _nickname(account_id),
+            'created_at': created_at,
+            'updated_at': rng.randint(created_at, 1600000000),
+            'last_battle_time': rng.randint(created_at, 1600000000),
+            'statistics': {
+                'all': statistics,
+                'max_frags': rng.randint(0, 15),
+                'max_xp': rng.randint(0, 4000),
+                'trees_cut': rng.randint(0, 100000)
+            }
+        }
+
+    def _vehicles(self, realm, account_id):
+        rng = realm.random('vehicles', account_id)
+        owned = rng.sample(_tanks, rng.randint(1, 120))
+        return sorted(owned)
+
+    def _tank(self, realm, account_id, tank_id):
+        rng = realm.random('tank', account_id * 65536 + tank_id)
+        return {
+            'account_id': account_id,
+            'tank_id': tank_id,
+            'in_garage': rng.random() < 0.7,
+            'last_battle_time': rng.randint(1400000000, 1600000000),
+            'mark_of_mastery': rng.randint(0, 4),
+            'max_frags': rng.randint(0, 10),
+            'max_xp': rng.randint(0, 3000),
+            'all': _statistics(rng, rng.randint(0, 3000))
+        }
+
+    def _members_count(self, realm, clan_id):
+        return realm.random('clan', clan_id).randint(1, 100)
+
+    def _clan_of(self, realm, account_id):
+        if not 0 < account_id <= self.players:
+            return None
+        clan_id = (account_id - 1) % self.clans + 1
+        if (account_id - 1) // self.clans < self._members_count(realm,
+                                                                clan_id):
+            return clan_id
+        return None
+
+    def _members(self, realm, clan_id):
+        return [clan_id + n * self.clans
+                for n in range(self._members_count(realm, clan_id))
+                if clan_id + n * self.clans <= self.players]
+
+    def _clan(self, realm, clan_id, extra=()):
+        if not 0 < clan_id <= self.clans:
+            return None
+        rng = realm.random('clan', clan_id)
+        members = self._members(realm, clan_id)
+        clan = {
+            'clan_id': clan_id,
+            'name': 'Clan {}'.format(clan_id),
+            'tag': 'C{}'.format(clan_id)[:5],
+            'created_at': rng.randint(1400000000, 1500000000),
+            'leader_id': members[0] if members else None,
+            'members_count': len(members),
+            'members_ids': members,
+            'is_clan_disbanded': False
+        }
+        if 'members' in extra:
+            clan['members'] = dict((str(member), {
+                'account_id': member,
+                'account_name': _nickname(member),
+                'role': 'commander' if member == members[0] else 'private',
+                'joined_at': clan['created_at']
+            }) for member in members)
+        return clan
+
+    # Endpoints
+
+    def account_list(self, realm, params):
+        search = params.get('search', '')
+        limit = min(100, _number(params, 'limit', 100))
+        prefix = 'player'
+        if not search.lower().startswith(prefix):
+            return []
+        digits = search[len(prefix):]
+        if digits and not digits.isdigit():
+            return []
+        found = []
+        start = int(digits) if digits else 1
+        scale = 1
+        while len(found) < limit and start * scale <= self.players:
+            for account_id in range(start * scale, (start + 1) * scale):
+                if account_id > self.players or len(found) >= limit:
+                    break
+                if account_id > 0:
+                    found.append({'account_id': account_id,
+                                  'nickname': _nickname(account_id)})
+            if params.get('type') == 'exact':
+                break
+            scale *= 10
+        return found
+
+    def account_info(self, realm, params):
+        return dict((str(account_id), self._player(realm, account_id))
+                    for account_id in _ids(params, 'account_id', True))
+
+    def account_achievements(self, realm, params):
+        data = {}
+        for account_id in _ids(params, 'account_id', True):
+            if not 0 < account_id <= self.players:
+                data[str(account_id)] = None
+                continue
+            rng = realm.random('achievements', account_id)
+            data[str(account_id)] = {
+                'achievements': dict(('medal{}'.format(n), rng.randint(0, 50))
+                                     for n in range(20)),
+                'max_series': {'titleSniper': rng.randint(0, 30)}
+            }
+        return data
+
+    def clans_list(self, realm, params):
+        limit = min(100, _number(params, 'limit', 100))
+        page_no = _number(params, 'page_no', 1)
+        first = (page_no - 1) * limit + 1
+        data = [self._clan(realm, clan_id)
+                for clan_id in range(first, min(first + limit,
+                                                self.clans + 1))]
+        for clan in data:
+            del clan['members_ids']
+        return data, {'count': len(data), 'total': self.clans}
+
+    def clans_info(self, realm, params):
+        extra = _split(params.get('extra'))
+        return dict((str(clan_id), self._clan(realm, clan_id, extra))
+                    for clan_id in _ids(params, 'clan_id', True))
+
+    def clans_accountinfo(self, realm, params):
+        data = {}
+        for account_id in _ids(params, 'account_id', True):
+            clan_id = self._clan_of(realm, account_id)
+            data[str(account_id)] = None if clan_id is None else {
+                'account_id': account_id,
+                'account_name': _nickname(account_id),
+                'clan_id': clan_id,
+                'role': 'private',
+                'joined_at': realm.random('clan', clan_id).randint(
+                    1400000000, 1500000000)
+            }
+        return data
+
+    def clans_glossary(self, realm, params):
+        return {
+            'clans_roles': {'commander': 'Commander', 'private': 'Private'},
+            'settings': {'max_members_count': 100}
+        }
+
+    def tanks_stats(self, realm, params):
+        account_id = _ids(params, 'account_id', True)[0]
+        if not 0 < account_id <= self.players:
+            return {str(account_id): None}
+        owned = self._vehicles(realm, account_id)
+        wanted = set(_ids(params, 'tank_id'))
+        if wanted:
+            owned = [tank_id for tank_id in owned if tank_id in wanted]
+        tanks = [self._tank(realm, account_id, tank_id) for tank_id in owned]
+        if params.get('in_garage') in ('0', '1'):
+            garage = params['in_garage'] == '1'
+            tanks = [tank for tank in tanks if tank['in_garage'] == garage]
+        return {str(account_id): tanks}
+
+    def tanks_achievements(self, realm, params):
+        stats = self.tanks_stats(realm, params)
+        for account_id, tanks in stats.items():
+            if tanks is None:
+                continue
+            stats[account_id] = [{
+                'account_id': tank['account_id'],
+                'tank_id': tank['tank_id'],
+                'achievements': {'markOfMastery': tank['mark_of_mastery']},
+                'series': {}
+            } for tank in tanks]
+        return stats
+
+    def ratings_types(self, realm, params):
+        return dict((rating, {'type': rating, 'rank_fields': _rank_fields})
+                    for rating in ('1', '7', '28', 'all'))
+
+    def ratings_dates(self, realm, params):
+        return {params.get('type', 'all'): {'dates': [1500000000]}}
+
+    def ratings_accounts(self, realm, params):
+        return dict((str(account_id), self._rating(realm, account_id))
+                    for account_id in _ids(params, 'account_id', True))
+
+    def ratings_neighbors(self, realm, params):
+        account_id = _ids(params, 'account_id', True)[0]
+        limit = min(50, _number(params, 'limit', 5))
+        first = max(1, account_id - limit // 2)
+        return [self._rating(realm, neighbor)
+                for neighbor in range(first, first + limit)
+                if neighbor <= self.players]
+
+    def ratings_top(self, realm, params):
+        limit = min(1000, _number(params, 'limit', 10))
+        page_no = _number(params, 'page_no', 1)
+        first = (page_no - 1) * limit + 1
+        data = [self._rating(realm, account_id)
+                for account_id in range(first, min(first + limit,
+                                                   self.players + 1))]
+        return data, {'count': len(data), 'total': self.players}
+
+    def _rating(self, realm, account_id):
+        if not 0 < account_id <= self.players:
+            return None
+        rng = realm.random('rating', account_id)
+        rating = {'account_id': account_id}
+        for field in _rank_fields:
+            rating[field] = {'rank': account_id,
+                             'value': round(rng.random() * 3000, 2)}
+        return rating
+
+    def encyclopedia_info(self, realm, params):
+        return {'game_version': '1.0.{}'.format(self.seed),
+                'tanks_updated_at': 1500000000 + self.seed}
+
+    def encyclopedia_vehicles(self, realm, params):
+        wanted = _ids(params, 'tank_id') or _tanks
+        data = {}
+        for tank_id in wanted:
+            rng = realm.random('vehicle', tank_id)
+            data[str(tank_id)] = None if tank_id not in _tanks else {
+                'tank_id': tank_id,
+                'name': 'Tank {}'.format(tank_id),
+                'short_name': 'T{}'.format(tank_id),
+                'tier': rng.randint(1, 10),
+                'type': rng.choice(('lightTank', 'mediumTank', 'heavyTank',
+                                    'AT-SPG', 'SPG')),
+                'nation': rng.choice(('usa', 'germany', 'ussr', 'uk',
+                                      'france', 'japan', 'china'))
+            }
+        return data
+
+    def encyclopedia_misc(self, realm, params):
+        return dict((str(tank_id), {'tank_id': tank_id, 'items': []})
+                    for tank_id in _ids(params, 'tank_id', True))
+
+    def encyclopedia_static(self, realm, params):
+        return {'placeholder': {'name': 'Placeholder'}}
+
+
+#: Methods answering each endpoint
+_endpoints = {
+    'account/list/': StandInServer.account_list,
+    'account/info/': StandInServer.account_info,
+    'account/achievements/': StandInServer.account_achievements,
+    'clans/list/': StandInServer.clans_list,
+    'clans/info/': StandInServer.clans_info,
+    'clans/accountinfo/': StandInServer.clans_accountinfo,
+    'clans/glossary/': StandInServer.clans_glossary,
+    'tanks/stats/': StandInServer.tanks_stats,
+    'tanks/achievements/': StandInServer.tanks_achievements,
+    'ratings/types/': StandInServer.ratings_types,
+    'ratings/dates/': StandInServer.ratings_dates,
+    'ratings/accounts/': StandInServer.ratings_accounts,
+    'ratings/neighbors/': StandInServer.ratings_neighbors,
+    'ratings/top/': StandInServer.ratings_top,
+    'encyclopedia/info/': StandInServer.encyclopedia_info,
+    'encyclopedia/vehicles/': StandInServer.encyclopedia_vehicles,
+    'encyclopedia/vehiclepackages/': StandInServer.encyclopedia_misc,
+    'encyclopedia/vehicleupgrades/': StandInServer.encyclopedia_misc,
+    'encyclopedia/crewroles/': StandInServer.encyclopedia_static,
+    'encyclopedia/achievements/': StandInServer.encyclopedia_static
+}
+
+
+class _Realm(object):
+    r"""
+    Source of deterministic random numbers for one realm
+    """
+
+    _kinds = ('player', 'vehicles', 'tank', 'clan', 'achievements', 'rating',
+              'vehicle')
+
+    def __init__(self, seed, name):
+        self.base = seed * 7 + (name == 'ps4')
+
+    def random(self, kind, ident):
+        return random.Random(
+            (ident * 16 + self._kinds.index(kind)) * 1000003 + self.base)
+
+
+class _InvalidParameter(ValueError):
+    pass
+
+
+class _MissingParameter(ValueError):
+    pass
+
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        if self.command == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            params.update(parse_qsl(self.rfile.read(length).decode('utf-8')))
+        parts = url.path.strip('/').split('/', 1)
+        stand_in = self.server.stand_in
+        stand_in.wait()
+        try:
+            status, body = stand_in.handle(
+                parts[0], parts[1] + '/' if len(parts) > 1 else '', params)
+        except Exception:
+            # Still answer like the API would, rather than drop the connection
+            status, body = _error(500, 'INTERNAL_SERVER_ERROR')
+        raw = json.dumps(body).encode('utf-8')
+        encoding = None
+        if stand_in.compression:
+            encoding = _encoding(self.headers.get('Accept-Encoding'))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if encoding is not None:
+            raw = _compressors[encoding](raw)
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    do_POST = do_GET
+
+
+def _gzip(body):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _zstd(body):
+    # Compressors are not safe to share between the handler threads
+    return zstandard.ZstdCompressor().compress(body)
+
+
+#: Compressors for the encodings the server can answer with, by preference
+_compressors = {'gzip': _gzip, 'deflate': zlib.compress}
+_preference = ['gzip', 'deflate']
+if brotli is not None:
+    _compressors['br'] = brotli.compress
+    _preference.insert(0, 'br')
+if zstandard is not None:
+    _compressors['zstd'] = _zstd
+    _preference.insert(0, 'zstd')
+
+
+def _encoding(accept):
+    r"""
+    Pick the preferred encoding out of those in an ``Accept-Encoding``
+    header, or ``None`` to send the body as it is
+    """
+    accepted = set()
+    for part in (accept or '').split(','):
+        name, _, quality = part.strip().partition(';')
+        if quality.strip().replace(' ', '') not in ('q=0', 'q=0.0'):
+            accepted.add(name.strip().lower())
+    for name in _preference:
+        if name in accepted:
+            return name
+    return None
+
+
+def _error(code, message, field=None):
+    return 200, {
+        'status': 'error',
+        'error': {'code': code, 'message': message, 'field': field,
+                  'value': None}
+    }
+
+
+def _split(value):
+    if not value:
+        return []
+    return [part for part in value.split(',') if part]
+
+
+def _ids(params, name, required=False):
+    try:
+        ids = [int(part) for part in _split(params.get(name))]
+    except ValueError:
+        raise _InvalidParameter(name)
+    if required and not ids:
+        raise _MissingParameter(name)
+    return ids
+
+
+def _number(params, name, default):
+    try:
+        return int(params.get(name) or default)
+    except ValueError:
+        raise _InvalidParameter(name)
+
+
+def _nickname(account_id):
+    return 'player{}'.format(account_id)
+
+
+def _statistics(rng, battles):
+    stats = dict((stat, rng.randint(0, battles * 1000)) for stat in _stats)
+    wins = rng.randint(0, battles)
+    stats.update({'battles': battles, 'wins': wins,
+                  'losses': rng.randint(0, battles - wins)})
+    return stats
+
+
+def _project(data, fields, endpoint):
+    r"""
+    Apply the ``fields`` parameter to every record of a response, keeping
+    only the listed fields or, for those starting with "-", dropping them
+    """
+    include = [field for field in fields if not field.startswith('-')]
+    exclude = [field[1:] for field in fields if field.startswith('-')]
+
+    def project(record):
+        if isinstance(record, list):
+            return [project(item) for item in record]
+        if not isinstance(record, dict):
+            return record
+        if include:
+            record = _select(record, [field.split('.') for field in include])
+        for field in exclude:
+            _drop(record, field.split('.'))
+        return record
+
+    if isinstance(data, list) or endpoint in ('clans/glossary/',
+                                              'encyclopedia/info/'):
+        return project(data)
+    return dict((key, project(value)) for key, value in data.items())
+
+
+def _select(record, paths):
+    selected = {}
+    for path in paths:
+        if path[0] not in record:
+            continue
+        if len(path) == 1 or not isinstance(record[path[0]], dict):
+            selected[path[0]] = record[path[0]]
+        else:
+            nested = _select(record[path[0]], [path[1:]])
+            selected.setdefault(path[0], {}).update(nested)
+    return selected
+
+
+def _drop(record, path):
+    if len(path) == 1:
+        record.pop(path[0], None)
+    elif isinstance(record.get(path[0]), dict):
+        _drop(record[path[0]], path[1:])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Serve synthetic data in the shape of WG\'s Console API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--players', type=int, default=1000000)
+    parser.add_argument('--clans', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--no-compression', dest='compression',
+                        action='store_false')
+    options = parser.parse_args(args)
+    server = StandInServer(
+        options.host, options.port, options.players, options.clans,
+        options.seed, options.latency, options.error_rate, options.rate_limit,
+        options.compression)
+    print('Serving on {} (Ctrl-C to stop)'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
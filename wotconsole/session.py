@@ -1,3 +1,5 @@
+from functools import partial
+
 from .api import (
     player_search, player_data, player_achievements, player_data_uid,
     player_sign_in, extend_player_sign_in, player_sign_out, clan_search,
@@ -7,6 +9,15 @@ from .api import (
     adjacent_positions_in_ratings, top_players, player_tank_statistics,
     player_tank_achievements
 )
+from .batching import RequestBatcher
+from .cache import TankopediaCache
+from .metrics import Metrics
+from .projection import FieldLearner
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .streaming import _Streaming
+from .transport import WOTXTransport
+from .utils import _paginate
 
 
 class WOTXSession(object):
@@ -17,20 +28,159 @@ class WOTXSession(object):
     .. note:: You may override settings by passing in the appropriate parameter
        at each function call
 
+    All requests made through the session share a pooled, keep-alive
+    :py:class:`~.WOTXTransport`, so connections to each realm are reused
+    between calls (and between the chunks of auto-split requests).
+
     :param str application_id: Your application key (generated by WG)
     :param str language: Localized language
-    :param str realm: Platform API. "xbox" or "ps4"
+    :param realm: Platform API. "xbox" or "ps4", or both (such as
+                  ``('xbox', 'ps4')``) to send every request to each realm
+                  at once. Methods then return a dictionary of each realm's
+                  response, and :py:meth:`iter_clans` and
+                  :py:meth:`iter_top_players` need a single ``api_realm``
+                  passed in
+    :type realm: str or tuple(str)
+    :param int pool_maxsize: Maximum connections kept alive per realm
+    :param int max_workers: Maximum chunks of a split request sent at once.
+                            Chunks are sent one at a time by default
+    :param float rate_limit: Maximum requests per second sent with each
+                             application ID. Unlimited by default
+    :param int burst: Requests that may be sent back-to-back before the rate
+                      limit kicks in
+    :param str cache_dir: Directory to cache Tankopedia responses in. They are
+                          kept until the game is updated. Not cached by
+                          default
+    :param float batch_window: Seconds to hold single-ID lookups from
+                               :py:meth:`player_data`,
+                               :py:meth:`player_achievements`,
+                               :py:meth:`player_clan_data` and
+                               :py:meth:`clan_details` so that those made
+                               from other threads in the meantime can be sent
+                               in the same request. Not batched by default
+    :param bool lazy: Only decode response bodies once their data is
+                      accessed, for callers that mostly check ``status`` or
+                      pass ``raw`` along untouched
+    :param keep_raw: What to keep of each :py:mod:`requests` response once
+                     its body is decoded: all of it (``True``), only its
+                     status code, URL and elapsed time (``'summary'``) or
+                     nothing (``False``)
+    :type keep_raw: bool or str
+    :param decoder: JSON decoder for response bodies: "orjson", "ujson",
+                    "simdjson", "json" or "auto" (the fastest installed), or
+                    any function decoding bytes. Left to :py:mod:`requests`
+                    by default
+    :type decoder: str or callable
+    :param retry: Times to retry failed requests (and each chunk of split
+                  requests) with exponential backoff, or a
+                  :py:class:`~.RetryPolicy` for finer control. Not retried by
+                  default
+    :type retry: int or RetryPolicy
+    :param cassette: Record every response, or replay recorded responses
+                     without touching the network
+    :type cassette: Cassette
+    :param metrics: Record the number, size, duration and outcome of every
+                    request, per endpoint. Pass ``True`` to start recording,
+                    or a :py:class:`~.Metrics` to record into (for example,
+                    one with a callback). Read them from the session's
+                    ``metrics`` attribute
+    :type metrics: bool or Metrics
+    :param learn_fields: Learn which fields are read from the responses of
+                         :py:meth:`player_data`, :py:meth:`clan_details` and
+                         :py:meth:`player_tank_statistics` at each place
+                         they are called from, and only request those from
+                         then on. Pass ``True`` to start learning, or a
+                         :py:class:`~.FieldLearner` to share. Read them from
+                         the session's ``learner`` attribute
+    :type learn_fields: bool or FieldLearner
+    :param compression: Encodings to ask for responses in: "auto" for every
+                        one that can be decoded (gzip and deflate, plus
+                        brotli and zstd if their packages are installed),
+                        ``None`` for uncompressed responses, or a list such
+                        as ``['gzip']``
+    :type compression: str or list(str)
+    :param transport: Use an existing transport instead of creating one.
+                      Allows several sessions to share the same pools
+    :type transport: WOTXTransport
     """
 
-    def __init__(self, application_id='demo', language='en', api_realm='xbox'):
+    _streaming = _Streaming
+
+    def __init__(self, application_id='demo', language='en', api_realm='xbox',
+                 pool_maxsize=10, max_workers=1, rate_limit=None, burst=None,
+                 cache_dir=None, batch_window=None, lazy=False,
+                 keep_raw=True, decoder=None, retry=None, cassette=None,
+                 metrics=None, learn_fields=None, compression='auto',
+                 transport=None):
         self.application_id = application_id
         self.language = language
         if api_realm is None:
             self.api_realm = 'xbox'
-        elif api_realm.lower() not in ('xbox', 'ps4'):
-            raise ValueError('Parameter "api_realm" is invalid!')
+        elif isinstance(api_realm, str):
+            self.api_realm = _realm(api_realm)
         else:
-            self.api_realm = api_realm.lower()
+            self.api_realm = tuple(_realm(realm) for realm in api_realm)
+        if transport is None:
+            transport = WOTXTransport(
+                pool_maxsize=max(pool_maxsize, max_workers),
+                max_workers=max_workers,
+                limiter=_limiter(rate_limit, burst),
+                cache=_cache(cache_dir),
+                lazy=lazy,
+                keep_raw=keep_raw,
+                decoder=decoder,
+                retry=_retry(retry),
+                cassette=cassette,
+                metrics=_metrics(metrics),
+                compression=compression)
+        self.transport = transport
+        self.metrics = getattr(transport, 'metrics', None)
+        self.learner = _learner(learn_fields)
+        self.batcher = None
+        if batch_window is not None:
+            self.batcher = RequestBatcher(batch_window)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        r"""
+        Close all pooled connections held by the session's transport
+        """
+        self.transport.close()
+
+    def stream(self, method, *args, **kwargs):
+        r"""
+        Call one of the session's methods, yielding each entry of the
+        response's ``data`` as soon as it is received instead of waiting for
+        the whole response. Only one entry is held in memory at a time.
+
+        .. code:: python
+
+            >>> for account_id, clan in sess.stream(
+            ...         'clan_details', clan_ids, extra=['members']):
+            ...     export(account_id, clan)
+
+        .. note:: Requests are only sent once iteration begins. Tankopedia
+           responses are not cached, and lookups are not batched. A failed
+           request is only retried if none of its entries have been yielded
+           yet. The entries of split requests are yielded chunk by chunk, so
+           :py:meth:`player_tank_statistics` yields a player once for every
+           100 vehicles
+
+        :param str method: Name of the method to call, such as "top_players"
+        :return: ``(key, record)`` pairs, or ``(index, record)`` for methods
+                 returning a list
+        :rtype: generator(tuple)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Remaining arguments are passed on to the method
+        """
+        kwargs['session'] = self._streaming(self.transport)
+        return getattr(self, method)(*args, **kwargs)
 
     def player_search(self, search, application_id=None, **kwargs):
         r"""
@@ -68,6 +218,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_search(search, application_id, **kwargs)
 
     def player_data(self, account_id, application_id=None, **kwargs):
@@ -96,6 +248,15 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
+        if self.learner is not None and 'fields' not in kwargs:
+            return self.learner.request(
+                self, 'player_data', partial(
+                    self.player_data, account_id, application_id), kwargs)
+        if self.batcher is not None:
+            return self.batcher.submit(
+                player_data, account_id, application_id, kwargs)
         return player_data(account_id, application_id, **kwargs)
 
     def player_achievements(self, account_id, application_id=None, **kwargs):
@@ -122,6 +283,11 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
+        if self.batcher is not None:
+            return self.batcher.submit(
+                player_achievements, account_id, application_id, kwargs)
         return player_achievements(account_id, application_id, **kwargs)
 
     def player_data_uid(self, uid, application_id=None, **kwargs):
@@ -144,6 +310,8 @@ class WOTXSession(object):
             application_id = self.application_id
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_data_uid(uid, application_id, **kwargs)
 
     def player_sign_in(self, application_id=None, **kwargs):
@@ -178,6 +346,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_sign_in(application_id, **kwargs)
 
     def extend_player_sign_in(self, access_token, application_id=None,
@@ -201,6 +371,8 @@ class WOTXSession(object):
             application_id = self.application_id
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return extend_player_sign_in(access_token, application_id, **kwargs)
 
     def player_sign_out(self, access_token, application_id=None, **kwargs):
@@ -221,6 +393,8 @@ class WOTXSession(object):
             application_id = self.application_id
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_sign_out(access_token, application_id, **kwargs)
 
     def clan_search(self, application_id=None, **kwargs):
@@ -251,8 +425,30 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return clan_search(application_id, **kwargs)
 
+    def iter_clans(self, page_no=1, limit=100, prefetch=2, **kwargs):
+        r"""
+        Iterate over clans, page by page
+
+        The next ``prefetch`` pages are requested in the background while the
+        current one is being read. Iteration stops after the last page.
+
+        :param int page_no: Page to start from. Default is 1
+        :param int limit: Number of clans per page. Default (and max) is 100
+        :param int prefetch: Pages to request ahead of time. Default is 2
+        :return: Clans, in order
+        :rtype: generator(dict)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Accepts the same keyword arguments as :py:meth:`clan_search`
+        """
+        return _paginate(
+            lambda n: self.clan_search(page_no=n, limit=limit, **kwargs),
+            page_no, limit, prefetch)
+
     def clan_details(self, clan_id, application_id=None, **kwargs):
         r"""
         Retrieve detailed information on one or more clans.
@@ -281,6 +477,15 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
+        if self.learner is not None and 'fields' not in kwargs:
+            return self.learner.request(
+                self, 'clan_details', partial(
+                    self.clan_details, clan_id, application_id), kwargs)
+        if self.batcher is not None:
+            return self.batcher.submit(
+                clan_details, clan_id, application_id, kwargs)
         return clan_details(clan_id, application_id, **kwargs)
 
     def player_clan_data(self, account_id, application_id=None, **kwargs):
@@ -308,6 +513,11 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
+        if self.batcher is not None:
+            return self.batcher.submit(
+                player_clan_data, account_id, application_id, kwargs)
         return player_clan_data(account_id, application_id, **kwargs)
 
     def clan_glossary(self, application_id=None, **kwargs):
@@ -332,6 +542,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return clan_glossary(application_id, **kwargs)
 
     def crew_info(self, application_id=None, **kwargs):
@@ -356,6 +568,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return crew_info(application_id, **kwargs)
 
     def vehicle_info(self, application_id=None, **kwargs):
@@ -386,6 +600,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return vehicle_info(application_id, **kwargs)
 
     def packages_info(self, tank_id, application_id=None, **kwargs):
@@ -413,6 +629,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return packages_info(tank_id, application_id, **kwargs)
 
     def equipment_consumable_info(
@@ -441,6 +659,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return equipment_consumable_info(tank_id, application_id, **kwargs)
 
     def achievement_info(self, application_id=None, **kwargs):
@@ -472,6 +692,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return achievement_info(application_id, **kwargs)
 
     def tankopedia_info(self, application_id=None, **kwargs):
@@ -496,6 +718,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return tankopedia_info(application_id, **kwargs)
 
     def types_of_ratings(self, application_id=None, **kwargs):
@@ -527,6 +751,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return types_of_ratings(application_id, **kwargs)
 
     def dates_with_ratings(self, rating, application_id=None, **kwargs):
@@ -558,6 +784,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return dates_with_ratings(rating, application_id, **kwargs)
 
     def player_ratings(self, rating, account_id,
@@ -594,6 +822,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_ratings(rating, application_id, **kwargs)
 
     def adjacent_positions_in_ratings(self, account_id, rank_field, rating,
@@ -633,6 +863,8 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return adjacent_positions_in_ratings(
             account_id, rank_field, rating, application_id, **kwargs)
 
@@ -674,8 +906,35 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return top_players(rank_field, rating, application_id, **kwargs)
 
+    def iter_top_players(self, rank_field, rating, page_no=1, limit=1000,
+                         prefetch=2, **kwargs):
+        r"""
+        Iterate over the list of top players, page by page
+
+        The next ``prefetch`` pages are requested in the background while the
+        current one is being read. Iteration stops after the last page.
+
+        :param str rank_field: Rating category
+        :param str rating: Rating period
+        :param int page_no: Page to start from. Default is 1
+        :param int limit: Number of entries per page. Default (and max) is
+                          1000
+        :param int prefetch: Pages to request ahead of time. Default is 2
+        :return: Player ratings, in order
+        :rtype: generator(dict)
+        :raises WOTXResponseError: If the API returns with an "error" field
+
+        Accepts the same keyword arguments as :py:meth:`top_players`
+        """
+        return _paginate(
+            lambda n: self.top_players(
+                rank_field, rating, page_no=n, limit=limit, **kwargs),
+            page_no, limit, prefetch)
+
     def player_tank_statistics(self, account_id, application_id=None,
                                **kwargs):
         r"""
@@ -706,6 +965,13 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
+        if self.learner is not None and 'fields' not in kwargs:
+            return self.learner.request(
+                self, 'player_tank_statistics',
+                partial(self.player_tank_statistics, account_id,
+                        application_id), kwargs)
         return player_tank_statistics(account_id, application_id, **kwargs)
 
     def player_tank_achievements(self, account_id, application_id=None,
@@ -738,4 +1004,60 @@ class WOTXSession(object):
             kwargs['language'] = self.language
         if 'api_realm' not in kwargs:
             kwargs['api_realm'] = self.api_realm
+        if 'session' not in kwargs:
+            kwargs['session'] = self.transport
         return player_tank_achievements(account_id, application_id, **kwargs)
+
+
+def _realm(name):
+    r"""
+    Validate a realm's name, in lower case
+    """
+    if name.lower() not in ('xbox', 'ps4'):
+        raise ValueError('Parameter "api_realm" is invalid!')
+    return name.lower()
+
+
+def _limiter(rate_limit, burst):
+    r"""
+    Create a rate limiter for a session, if it is to be throttled
+    """
+    if rate_limit is None:
+        return None
+    return RateLimiter(rate_limit, burst)
+
+
+def _cache(cache_dir):
+    r"""
+    Create a Tankopedia cache for a session, if one is to be kept
+    """
+    if cache_dir is None:
+        return None
+    return TankopediaCache(cache_dir)
+
+
+def _retry(retry):
+    r"""
+    Create a retry policy for a session, if failed requests are to be retried
+    """
+    if retry is None or isinstance(retry, RetryPolicy):
+        return retry
+    return RetryPolicy(retry)
+
+
+def _learner(learn_fields):
+    r"""
+    Create a field learner for a session, if fields are to be learned
+    """
+    if learn_fields is True:
+        return FieldLearner()
+    return learn_fields or None
+
+
+def _metrics(metrics):
+    r"""
+    Create a metrics recorder for a session, if requests are to be measured
+    """
+    if metrics is True:
+        return Metrics()
+    return metrics or None
@@ -0,0 +1,285 @@
+r"""
+Persistent storage of API responses in SQLite
+"""
+
+import json
+import sqlite3
+from threading import Lock
+
+#: Tables, their columns and where each column's value is found in a record.
+#: Every table also keeps the whole record as JSON in its ``data`` column
+_tables = {
+    'players': (
+        ('account_id', 'INTEGER PRIMARY KEY', 'account_id'),
+        ('nickname', 'TEXT', 'nickname'),
+        ('created_at', 'INTEGER', 'created_at'),
+        ('updated_at', 'INTEGER', 'updated_at'),
+        ('last_battle_time', 'INTEGER', 'last_battle_time'),
+        ('battles', 'INTEGER', 'statistics.all.battles'),
+        ('wins', 'INTEGER', 'statistics.all.wins')
+    ),
+    'clans': (
+        ('clan_id', 'INTEGER PRIMARY KEY', 'clan_id'),
+        ('tag', 'TEXT', 'tag'),
+        ('name', 'TEXT', 'name'),
+        ('created_at', 'INTEGER', 'created_at'),
+        ('leader_id', 'INTEGER', 'leader_id'),
+        ('members_count', 'INTEGER', 'members_count'),
+        ('is_clan_disbanded', 'INTEGER', 'is_clan_disbanded')
+    ),
+    'clan_members': (
+        ('account_id', 'INTEGER PRIMARY KEY', 'account_id'),
+        ('clan_id', 'INTEGER', 'clan_id'),
+        ('account_name', 'TEXT', 'account_name'),
+        ('role', 'TEXT', 'role'),
+        ('joined_at', 'INTEGER', 'joined_at')
+    ),
+    'tank_statistics': (
+        ('account_id', 'INTEGER', 'account_id'),
+        ('tank_id', 'INTEGER', 'tank_id'),
+        ('in_garage', 'INTEGER', 'in_garage'),
+        ('last_battle_time', 'INTEGER', 'last_battle_time'),
+        ('mark_of_mastery', 'INTEGER', 'mark_of_mastery'),
+        ('battles', 'INTEGER', 'all.battles'),
+        ('wins', 'INTEGER', 'all.wins')
+    )
+}
+
+_schema = '''
+CREATE INDEX IF NOT EXISTS clan_members_clan_id ON clan_members (clan_id);
+CREATE INDEX IF NOT EXISTS tank_statistics_tank_id
+    ON tank_statistics (tank_id);
+'''
+
+
+class SQLiteStore(object):
+    r"""
+    SQLite database of players, clans, clan members and vehicle statistics.
+
+    Each ``save_*`` method takes a :py:class:`~.WOTXResponse` (or its
+    ``data``) from the matching endpoint and inserts or replaces one row per
+    record, keyed by account, clan and tank ID. Commonly queried values get
+    columns of their own, and every record is also kept whole as JSON in the
+    ``data`` column.
+
+    Rows are buffered and written ``batch_size`` at a time, each batch in a
+    single transaction. Call :py:meth:`flush` (or close the store) to write
+    the rest.
+
+    .. code:: python
+
+        >>> with SQLiteStore('realm.db') as store:
+        ...     crawler = Crawler(sess, store.sink('player_data'))
+        ...     crawler.crawl(range(1, 20000000))
+        >>> store.connection.execute(
+        ...     'SELECT nickname FROM players ORDER BY wins DESC LIMIT 10')
+
+    :param str path: Database file. Created, along with its tables, if
+                     missing
+    :param int batch_size: Rows to buffer before writing them
+    """
+
+    def __init__(self, path, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        for table, columns in _tables.items():
+            definitions = ['{} {}'.format(name, kind)
+                           for name, kind, _ in columns]
+            definitions.append('data TEXT')
+            if table == 'tank_statistics':
+                definitions.append('PRIMARY KEY (account_id, tank_id)')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS {} ({})'.format(
+                    table, ', '.join(definitions)))
+        self.connection.executescript(_schema)
+        self.connection.commit()
+        self._pending = []
+        self._rows = 0
+        self._lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def save_players(self, response):
+        r"""
+        Store the players of a ``player_data`` response. Players that do not
+        exist are skipped
+
+        :param response: Response, or its ``data``
+        :type response: WOTXResponse or dict
+        """
+        self._upsert('players', [
+            _row('players', player, account_id=int(account_id))
+            for account_id, player in _data(response).items()
+            if player is not None])
+
+    def save_clans(self, response):
+        r"""
+        Store the clans of a ``clan_details`` response. Their members are
+        stored too if the response was requested with ``extra=['members']``,
+        replacing any members stored for those clans before. Members may be
+        given by account ID or as a list
+
+        :param response: Response, or its ``data``
+        :type response: WOTXResponse or dict
+        """
+        clans = [(int(clan_id), clan)
+                 for clan_id, clan in _data(response).items()
+                 if clan is not None]
+        self._upsert('clans', [_row('clans', clan, clan_id=clan_id)
+                               for clan_id, clan in clans])
+        listed = [(clan_id, _members(clan['members']))
+                  for clan_id, clan in clans
+                  if isinstance(clan.get('members'), (dict, list))]
+        if listed:
+            self._write('DELETE FROM clan_members WHERE clan_id = ?',
+                        [(clan_id, ) for clan_id, _ in listed])
+            self._upsert('clan_members', [
+                _row('clan_members', member, account_id=int(account_id),
+                     clan_id=clan_id)
+                for clan_id, members in listed
+                for account_id, member in members])
+
+    def save_clan_memberships(self, response):
+        r"""
+        Store the clans of the players in a ``player_clan_data`` response.
+        Players who are not in a clan are removed from their former clan
+
+        :param response: Response, or its ``data``
+        :type response: WOTXResponse or dict
+        """
+        data = _data(response)
+        self._write('DELETE FROM clan_members WHERE account_id = ?',
+                    [(int(account_id), )
+                     for account_id, member in data.items()
+                     if member is None])
+        self._upsert('clan_members', [
+            _row('clan_members', member, account_id=int(account_id))
+            for account_id, member in data.items() if member is not None])
+
+    def save_tank_statistics(self, response):
+        r"""
+        Store the vehicle statistics in a ``player_tank_statistics`` response
+
+        :param response: Response, or its ``data``
+        :type response: WOTXResponse or dict
+        """
+        self._upsert('tank_statistics', [
+            _row('tank_statistics', tank, account_id=int(account_id))
+            for account_id, tanks in _data(response).items()
+            for tank in tanks or ()])
+
+    def save_player(self, account_id, player, tanks=None):
+        r"""
+        Store a single player, and optionally their vehicle statistics. May be
+        used as the sink of a :py:class:`~.DeltaSync`
+
+        :param account_id: Player ID
+        :type account_id: int or str
+        :param dict player: Player's data from ``player_data``
+        :param tanks: Player's vehicle statistics
+        :type tanks: list(dict)
+        """
+        if player is not None:
+            self.save_players({account_id: player})
+        if tanks is not None:
+            self.save_tank_statistics({account_id: tanks})
+
+    def sink(self, method):
+        r"""
+        Crawler sink storing each response of a session method
+
+        :param str method: "player_data", "clan_details", "player_clan_data"
+                           or "player_tank_statistics"
+        :return: Function storing a response
+        :raises ValueError: If responses of the method cannot be stored
+        """
+        sinks = {
+            'player_data': self.save_players,
+            'clan_details': self.save_clans,
+            'player_clan_data': self.save_clan_memberships,
+            'player_tank_statistics': self.save_tank_statistics
+        }
+        try:
+            return sinks[method]
+        except KeyError:
+            raise ValueError(
+                'Responses of "{}" cannot be stored'.format(method))
+
+    def flush(self):
+        r"""
+        Write every buffered row in a single transaction
+        """
+        with self._lock:
+            pending, self._pending, self._rows = self._pending, [], 0
+            with self.connection:
+                for statement, rows in pending:
+                    self.connection.executemany(statement, rows)
+
+    def close(self):
+        r"""
+        Write every buffered row and close the database
+        """
+        self.flush()
+        self.connection.close()
+
+    def _upsert(self, table, rows):
+        columns = [name for name, _, _ in _tables[table]] + ['data']
+        self._write('INSERT OR REPLACE INTO {} ({}) VALUES ({})'.format(
+            table, ', '.join(columns), ', '.join('?' * len(columns))), rows)
+
+    def _write(self, statement, rows):
+        r"""
+        Buffer rows for a statement, keeping statements in order so that
+        later writes to the same rows win
+        """
+        if not rows:
+            return
+        with self._lock:
+            if self._pending and self._pending[-1][0] == statement:
+                self._pending[-1][1].extend(rows)
+            else:
+                self._pending.append((statement, list(rows)))
+            self._rows += len(rows)
+            full = self._rows >= self.batch_size
+        if full:
+            self.flush()
+
+
+def _data(response):
+    return getattr(response, 'data', response)
+
+
+def _members(members):
+    r"""
+    ``(account_id, member)`` pairs of a clan's members, whether keyed by
+    account ID or listed
+    """
+    if isinstance(members, dict):
+        return list(members.items())
+    return [(member['account_id'], member) for member in members
+            if isinstance(member, dict) and 'account_id' in member]
+
+
+def _row(table, record, **ids):
+    r"""
+    Values of a table's columns for a record, with IDs taken from the keys
+    of the response where given
+    """
+    values = []
+    for name, _, path in _tables[table]:
+        if name in ids:
+            values.append(ids[name])
+            continue
+        value = record
+        for key in path.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(value)
+    values.append(json.dumps(record, separators=(',', ':')))
+    return tuple(values)
@@ -0,0 +1,227 @@
+r"""
+Incremental parsing of API responses, record by record
+"""
+
+import codecs
+from itertools import chain
+import json
+import re
+
+from .api import WOTXResponseError
+
+#: Whitespace allowed between JSON tokens
+_ws = re.compile(r'[ \t\n\r]*')
+
+#: Matches the token that must follow a complete value
+_delimiter = re.compile(r'[ \t\n\r]*[,:}\]]')
+
+
+class RecordParser(object):
+    r"""
+    Push parser for the body of an API response.
+
+    Chunks of the body are fed in as they arrive, and every entry of ``data``
+    is returned as soon as it has been received in full: ``(key, record)`` for
+    dictionaries and ``(index, record)`` for lists. Only the record being
+    received is buffered, so memory use does not grow with the size of the
+    response.
+
+    Other top-level fields, such as ``status`` and ``meta``, are collected in
+    :py:attr:`fields`.
+
+    .. code:: python
+
+        >>> parser = RecordParser()
+        >>> parser.feed(b'{"status":"ok","data":{"1":{"nick')
+        []
+        >>> parser.feed(b'name":"a"},"2":null}}')
+        [('1', {'nickname': 'a'}), ('2', None)]
+        >>> parser.close()
+
+    :ivar fields: Top-level fields of the response, other than ``data``
+    :type fields: dict
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+        self._index = None
+
+    def feed(self, chunk, final=False):
+        r"""
+        Parse the next chunk of the body
+
+        :param bytes chunk: Next part of the body
+        :param bool final: Whether this is the last chunk
+        :return: Entries of ``data`` completed by this chunk
+        :rtype: list(tuple)
+        :raises ValueError: If the body is not valid JSON
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(
+            chunk, final)
+        self._pos = 0
+        records = []
+        while self._step(records, final):
+            pass
+        return records
+
+    def close(self):
+        r"""
+        Signal the end of the body
+
+        :return: Entries of ``data`` completed by the end of the body
+        :rtype: list(tuple)
+        :raises ValueError: If the body ended early
+        :raises WOTXResponseError: If the API returned with an "error" field
+        """
+        records = self.feed(b'', True)
+        if self._state != 'done':
+            raise ValueError('Response body ended unexpectedly')
+        if self.fields.get('status') == 'error' or 'error' in self.fields:
+            raise WOTXResponseError(self.fields)
+        return records
+
+    def _step(self, records, final):
+        r"""
+        Consume one token or value. Returns ``False`` once more of the body is
+        needed
+        """
+        buf = self._buffer
+        self._pos = _ws.match(buf, self._pos).end()
+        if self._pos >= len(buf) or self._state == 'done':
+            return False
+        char = buf[self._pos]
+        state = self._state
+        if state == 'start':
+            self._expect(char, '{', 'key')
+        elif state == 'key':
+            if char == '}':
+                self._pos += 1
+                self._state = 'done'
+            elif char == ',':
+                self._pos += 1
+            else:
+                return self._value(final, self._set_key)
+        elif state == 'colon':
+            self._expect(char, ':', 'data' if self._key == 'data' else 'field')
+        elif state == 'field':
+            return self._value(final, self._set_field)
+        elif state == 'data':
+            if char == '{':
+                self._index = None
+            elif char == '[':
+                self._index = 0
+            else:
+                return self._value(final, self._set_field)
+            self._pos += 1
+            self._state = 'record'
+        elif state == 'record':
+            if char in '}]':
+                self._pos += 1
+                self._state = 'key'
+            elif char == ',':
+                self._pos += 1
+            elif self._index is None:
+                return self._value(final, self._set_record_key)
+            else:
+                return self._value(final, lambda value: self._add(
+                    records, value))
+        elif state == 'record_colon':
+            self._expect(char, ':', 'record_value')
+        elif state == 'record_value':
+            return self._value(final, lambda value: self._add(records, value))
+        return True
+
+    def _expect(self, char, token, state):
+        if char != token:
+            raise ValueError('Expected "{}" at position {}, found "{}"'.format(
+                token, self._pos, char))
+        self._pos += 1
+        self._state = state
+
+    def _value(self, final, handle):
+        r"""
+        Decode the value at the current position and hand it to ``handle``,
+        unless it may still be incomplete
+        """
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except ValueError:
+            if final:
+                raise
+            return False
+        if not final and not _delimiter.match(self._buffer, end):
+            # A number could continue in the next chunk
+            return False
+        self._pos = end
+        handle(value)
+        return True
+
+    def _set_key(self, key):
+        self._key = key
+        self._state = 'colon'
+
+    def _set_field(self, value):
+        self.fields[self._key] = value
+        self._state = 'key'
+
+    def _set_record_key(self, key):
+        self._key = key
+        self._state = 'record_colon'
+
+    def _add(self, records, value):
+        if self._index is None:
+            records.append((self._key, value))
+        else:
+            records.append((self._index, value))
+            self._index += 1
+        self._state = 'record'
+
+
+def iter_records(chunks):
+    r"""
+    Parse an API response body incrementally, yielding each entry of ``data``
+    as soon as it has been received
+
+    :param chunks: Body of the response, in parts
+    :type chunks: iterable(bytes)
+    :return: ``(key, record)`` pairs for dictionaries, or ``(index, record)``
+             for lists
+    :rtype: generator(tuple)
+    :raises ValueError: If the body is not valid JSON
+    :raises WOTXResponseError: If the API returns with an "error" field
+    """
+    parser = RecordParser()
+    for chunk in chunks:
+        for record in parser.feed(chunk):
+            yield record
+    for record in parser.close():
+        yield record
+
+
+class _Streaming(object):
+    r"""
+    Stand-in for a transport, making functions from :py:mod:`wotconsole.api`
+    return the records of their response as they arrive instead of the
+    response itself. The records of split requests are chained together
+    """
+
+    #: Single-ID lookups are not combined by :py:class:`~.RequestBatcher`
+    batchable = False
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def fetch(self, url, params, timeout):
+        return self.transport.stream_records(url, params, timeout)
+
+    def dispatch(self, calls, merge):
+        return chain.from_iterable(call() for call in calls)
+
+    def fan_out(self, calls):
+        return dict((realm, call()) for realm, call in calls)
@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+import json
+import os
+
+from .utils import _write, chunker
+
+
+class DeltaSync(object):
+    r"""
+    Incremental refresh of player statistics, fetching them only for players
+    who have played since the last sync.
+
+    Each sync first requests just ``fields`` (by default the last battle and
+    update times) of every player, which is small and cheap. Players whose
+    values differ from the snapshot, or who are not in it yet, then have their
+    full ``player_data`` and, with ``tanks`` set, their
+    ``player_tank_statistics`` requested and handed to ``sink``. Everyone
+    else is skipped.
+
+    The snapshot is updated for each player once they have been handed to
+    ``sink``, and saved to ``snapshot`` when the sync ends, even if it
+    failed. Players that were not delivered are fetched again next time.
+
+    .. code:: python
+
+        >>> sync = DeltaSync(sess, store, snapshot='players.snapshot')
+        >>> sync.sync(tracked_ids)  # every player, the first time
+        25000
+        >>> sync.sync(tracked_ids)  # an hour later
+        3120
+
+    :param session: Session to send requests through
+    :type session: WOTXSession
+    :param sink: Called with the account ID (as a string), full player data
+                 and list of tank statistics (``None`` unless ``tanks`` is
+                 set) of every player who changed
+    :param str snapshot: File to keep the last seen values in. Only kept in
+                         memory if omitted
+    :param fields: Fields compared against the snapshot to tell whether a
+                   player changed
+    :type fields: list(str)
+    :param bool tanks: Also fetch the tank statistics of players who changed.
+                       This takes one request per player
+    :param int batch_size: IDs checked per call of :py:meth:`player_data`.
+                           Calls with more than 100 IDs are split into
+                           several requests, sent as the session allows
+    :param int max_workers: Players whose tank statistics are requested at
+                            once
+    """
+
+    #: Fields compared against the snapshot by default
+    fields = ('last_battle_time', 'updated_at')
+
+    def __init__(self, session, sink, snapshot=None, fields=None, tanks=True,
+                 batch_size=1000, max_workers=4):
+        self.session = session
+        self.sink = sink
+        self.path = snapshot
+        if fields is not None:
+            self.fields = tuple(fields)
+        self.tanks = tanks
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.snapshot = self.load()
+
+    def load(self):
+        r"""
+        Read the snapshot saved by the last sync
+
+        :return: Values of ``fields`` for each account ID
+        :rtype: dict
+        :raises ValueError: If the snapshot was saved with different fields
+        """
+        if self.path is None or not os.path.isfile(self.path):
+            return {}
+        with open(self.path, 'rb') as f:
+            state = json.loads(f.read().decode('utf-8'))
+        if tuple(state['fields']) != self.fields:
+            raise ValueError('Snapshot was saved with the fields {}'.format(
+                ', '.join(state['fields'])))
+        return state['players']
+
+    def save(self):
+        r"""
+        Write the snapshot to disk, if there is a file to keep it in
+        """
+        if self.path is not None:
+            _write(self.path, json.dumps({
+                'fields': self.fields,
+                'players': self.snapshot
+            }).encode('utf-8'))
+
+    def changed(self, account_id, player):
+        r"""
+        Whether a player's values differ from the snapshot
+
+        :param str account_id: Player ID
+        :param dict player: Player's values of ``fields``
+        :rtype: bool
+        """
+        return self.snapshot.get(account_id) != self._state(player)
+
+    def sync(self, ids, fields=None, tank_fields=None, **kwargs):
+        r"""
+        Check every player and deliver those who changed to the sink
+
+        :param ids: Player IDs to check
+        :type ids: iterable
+        :param fields: Fields of ``player_data`` to fetch for players who
+                       changed. Everything by default
+        :type fields: list(str)
+        :param tank_fields: Fields of ``player_tank_statistics`` to fetch for
+                            players who changed. Everything by default
+        :type tank_fields: list(str)
+        :return: Number of players delivered
+        :rtype: int
+        :raises WOTXResponseError: If the API returns with an "error" field.
+                                   The snapshot of players delivered up to
+                                   then is saved
+
+        Remaining keyword arguments, such as ``api_realm``, are passed on to
+        every request
+        """
+        delivered = 0
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            try:
+                for batch in chunker(ids, self.batch_size):
+                    current = self.session.player_data(
+                        batch, fields=list(self.fields), **kwargs).data
+                    stale = [key for key, player in current.items()
+                             if player is not None and
+                             self.changed(key, player)]
+                    for start in range(0, len(stale), 100):
+                        delivered += self._deliver(
+                            pool, stale[start:start + 100], current, fields,
+                            tank_fields, kwargs)
+            finally:
+                self.save()
+        return delivered
+
+    def _deliver(self, pool, stale, current, fields, tank_fields, kwargs):
+        players = self.session.player_data(stale, fields=fields, **kwargs).data
+        if self.tanks:
+            tanks = pool.map(
+                lambda key: self.session.player_tank_statistics(
+                    key, fields=tank_fields, **kwargs).data.get(key), stale)
+        else:
+            tanks = repeat(None)
+        for key, tank_stats in zip(stale, tanks):
+            self.sink(key, players.get(key), tank_stats)
+            self.snapshot[key] = self._state(current[key])
+        return len(stale)
+
+    def _state(self, player):
+        return [player.get(field) for field in self.fields]
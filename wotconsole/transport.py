@@ -0,0 +1,285 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Lock
+from time import sleep
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+from .api import WOTXResponse
+from .compression import accept_encoding
+from .decoders import get_decoder
+from .metrics import _counted
+from .streaming import RecordParser
+from .utils import _dispatch
+
+
+class WOTXTransport(Session):
+    r"""
+    Keep-alive HTTP transport for WG's API.
+
+    Connections are pooled per host, so each realm (``api-xbox-console`` and
+    ``api-ps4-console``) gets its own pool and repeated calls reuse the same
+    TCP and TLS connection instead of opening a new one every time.
+
+    Requests that exceed the API's parameter limits are split into chunks. By
+    default these are sent one after another; with ``max_workers`` greater
+    than 1 they are sent from a thread pool instead, that many at a time.
+    ``pool_maxsize`` should be at least as large as ``max_workers`` or the
+    extra connections will not be kept alive.
+
+    If given a :py:class:`~.RateLimiter`, every request (including each chunk
+    of a split request) waits for its turn before being sent.
+
+    If given a :py:class:`~.TankopediaCache`, responses from the Tankopedia
+    endpoints are served from disk until the game is updated.
+
+    May be passed as the ``session`` parameter to any function in
+    :py:mod:`wotconsole.api`.
+
+    :param int pool_connections: Number of host (realm) pools to keep
+    :param int pool_maxsize: Maximum connections kept alive in each pool
+    :param int max_workers: Maximum chunks of a split request in flight at
+                            once
+    :param limiter: Throttle requests to stay under WG's rate limit
+    :type limiter: RateLimiter
+    :param cache: Save responses that only change with game updates
+    :type cache: TankopediaCache
+    :param bool lazy: Only decode response bodies once their data is accessed
+    :param keep_raw: What to keep of each :py:mod:`requests` response once
+                     its body is decoded: all of it (``True``), only its
+                     status code, URL and elapsed time (``'summary'``) or
+                     nothing (``False``)
+    :type keep_raw: bool or str
+    :param decoder: JSON decoder for response bodies: "orjson", "ujson",
+                    "simdjson", "json" or "auto" (the fastest installed), or
+                    any function decoding bytes. Left to :py:mod:`requests`
+                    by default
+    :type decoder: str or callable
+    :param retry: Retry failed requests (and chunks of split requests)
+    :type retry: RetryPolicy
+    :param cassette: Record responses to, or replay them from, a cassette
+                     instead of only talking to the API
+    :type cassette: Cassette
+    :param metrics: Record the number, size, duration and outcome of every
+                    request
+    :type metrics: Metrics
+    :param compression: Encodings to ask for responses in: "auto" for every
+                        one that can be decoded (gzip and deflate, plus
+                        brotli and zstd if their packages are installed),
+                        ``None`` for uncompressed responses, or a list such
+                        as ``['gzip']``
+    :type compression: str or list(str)
+    :raises ValueError: If an encoding cannot be decoded with the packages
+                        installed
+    """
+
+    def __init__(self, pool_connections=2, pool_maxsize=10, max_workers=1,
+                 limiter=None, cache=None, lazy=False, keep_raw=True,
+                 decoder=None, retry=None, cassette=None, metrics=None,
+                 compression='auto'):
+        super(WOTXTransport, self).__init__()
+        self.headers['Accept-Encoding'] = accept_encoding(compression)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_workers = max_workers
+        self.limiter = limiter
+        self.cache = cache
+        self.lazy = lazy
+        self.keep_raw = keep_raw
+        self.decoder = None if decoder is None else get_decoder(decoder)
+        self.retry = retry
+        self.metrics = metrics
+        self._executor = None
+        self._lock = Lock()
+        self.cassette = cassette
+        adapter = HTTPAdapter if cassette is None else cassette.adapter
+        for prefix in ('https://', 'http://'):
+            self.mount(prefix, adapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize))
+
+    def fetch(self, url, params, timeout):
+        r"""
+        Send a request to the API and wrap the result
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters
+        :param int timeout: Maximum allowed time to wait for response from
+                            servers
+        :return: API response
+        :rtype: WOTXResponse
+        :raises WOTXResponseError: If the API returns with an "error" field
+        """
+        if self.cache is not None and self.cache.covers(url):
+            return self.cache.fetch(
+                url, params, timeout, self._send, lazy=self.lazy,
+                keep_raw=self.keep_raw, decoder=self.decoder)
+        return self._send(url, params, timeout)
+
+    def stream_records(self, url, params, timeout, chunk_size=65536):
+        r"""
+        Send a request to the API and parse the response as it arrives. The
+        request is sent once iteration begins. Failures are retried as long as
+        no record has been yielded yet, and the request is measured once the
+        whole body has been read
+
+        :param str url: Full URL of the endpoint
+        :param dict params: Query parameters
+        :param int timeout: Maximum allowed time to wait for response from
+                            servers
+        :param int chunk_size: Bytes to read from the connection at a time
+        :return: ``(key, record)`` pairs from the response's ``data``
+        :rtype: generator(tuple)
+        :raises WOTXResponseError: If the API returns with an "error" field
+        :raises requests.HTTPError: If the server answers with an HTTP error
+        """
+        for attempt in count():
+            started = False
+            try:
+                for record in self._stream_attempt(url, params, timeout,
+                                                   chunk_size):
+                    started = True
+                    yield record
+                return
+            except Exception as e:
+                # Records already yielded cannot be taken back
+                if self.retry is None or started:
+                    raise
+                wait = self.retry.schedule(e, attempt)
+                if wait is None:
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retried(url, e)
+            sleep(wait)
+
+    def _stream_attempt(self, url, params, timeout, chunk_size):
+        if self.limiter is not None:
+            self.limiter.acquire(params.get('application_id'))
+        start = monotonic()
+        size = 0
+        response = None
+        try:
+            response = self.get(url, params=params, timeout=timeout,
+                                stream=True)
+            response.raise_for_status()
+            parser = RecordParser()
+            for chunk in response.iter_content(chunk_size):
+                size += len(chunk)
+                for record in parser.feed(chunk):
+                    yield record
+            for record in parser.close():
+                yield record
+            if self.metrics is not None:
+                self.metrics.record(
+                    url, monotonic() - start, size,
+                    wire_size=_wire_size(response),
+                    encoding=response.headers.get('Content-Encoding'))
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record(url, monotonic() - start, size, e)
+            raise
+        finally:
+            if response is not None:
+                response.close()
+
+    def _send(self, url, params, timeout):
+        for attempt in count():
+            try:
+                return self._attempt(url, params, timeout)
+            except Exception as e:
+                if self.retry is None:
+                    raise
+                wait = self.retry.schedule(e, attempt)
+                if wait is None:
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retried(url, e)
+            sleep(wait)
+
+    def _attempt(self, url, params, timeout):
+        if self.limiter is not None:
+            self.limiter.acquire(params.get('application_id'))
+        start = monotonic()
+        response = None
+        try:
+            response = self.get(url, params=params, timeout=timeout)
+            if self.retry is not None and response.status_code >= 500:
+                response.raise_for_status()
+            size = len(response.content)
+            wire_size = _wire_size(response)
+            result = WOTXResponse(response, lazy=self.lazy,
+                                  keep_raw=self.keep_raw, decoder=self.decoder)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record(
+                    url, monotonic() - start,
+                    0 if response is None else len(response.content), e)
+            raise
+        if self.metrics is not None:
+            self.metrics.record(
+                url, monotonic() - start, size, wire_size=wire_size,
+                encoding=response.headers.get('Content-Encoding'))
+        return result
+
+    def dispatch(self, calls, merge):
+        r"""
+        Send every chunk of a split request, up to ``max_workers`` at a time
+
+        :param calls: Callables returning the response for each chunk
+        :type calls: iterable
+        :param merge: Function combining the responses, in order
+        :return: Merged API response
+        :rtype: WOTXResponse
+        """
+        calls = _counted(calls, self.metrics)
+        if self.max_workers <= 1:
+            return _dispatch(calls, merge)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+        return merge(_bounded(self._executor, calls, self.max_workers * 2))
+
+    def close(self):
+        r"""
+        Shut down the worker threads and close all pooled connections
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        super(WOTXTransport, self).close()
+
+
+def _wire_size(response):
+    r"""
+    Size of a response's body as it was received, before being decompressed
+    """
+    try:
+        return response.raw.tell()
+    except (AttributeError, ValueError):
+        return len(response.content)
+
+
+def _bounded(executor, calls, limit):
+    r"""
+    Yield the result of each call in order, with up to ``limit`` of them
+    submitted to the executor at a time
+    """
+    pending = deque()
+    try:
+        for call in calls:
+            pending.append(executor.submit(call))
+            if len(pending) < limit:
+                continue
+            yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
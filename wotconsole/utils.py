@@ -1,29 +1,92 @@
-from collections import Iterable
-from functools import wraps
-from itertools import islice
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from itertools import chain, islice
+import numbers
+import os
+import tempfile
+
+try:
+    _replace = os.replace
+except AttributeError:
+    _replace = os.rename
 
 
 def validate_realm(func):
     r"""
-    Checks the API realm for validity
+    Checks the API realm for validity.
+
+    Several realms may be given at once, such as ``('xbox', 'ps4')``. The
+    function is then called for every realm at the same time, through the
+    ``fan_out`` method of the transport passed in as ``session`` if it has
+    one, and a dictionary of each realm's response is returned.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             realm = kwargs['api_realm']
-            if not isinstance(realm, str) or realm.lower() not in (
-                    'xbox', 'ps4'):
-                raise ValueError('Argument "api_realm" is invalid!')
         except KeyError:
-            pass
-        return func(*args, **kwargs)
+            return func(*args, **kwargs)
+        if _not_iter(realm):
+            _check_realm(realm)
+            return func(*args, **kwargs)
+        realms = []
+        for name in realm:
+            _check_realm(name)
+            if name.lower() not in realms:
+                realms.append(name.lower())
+        # Every realm needs its own pass over one-shot iterators of IDs
+        args = tuple(_reusable(arg) for arg in args)
+        kwargs = dict((key, _reusable(value))
+                      for key, value in kwargs.items())
+        calls = [(name, partial(func, *args, **dict(kwargs, api_realm=name)))
+                 for name in realms]
+        fan_out = getattr(kwargs.get('session'), 'fan_out', _fan_out)
+        return fan_out(calls)
     return wrapper
 
 
+def _check_realm(realm):
+    if not isinstance(realm, str) or realm.lower() not in ('xbox', 'ps4'):
+        raise ValueError('Argument "api_realm" is invalid!')
+
+
+def _reusable(value):
+    r"""
+    Read one-shot iterators into a list, so that they may be read again
+    """
+    return list(value) if isinstance(value, Iterator) else value
+
+
+def _fan_out(calls):
+    r"""
+    Default realm dispatcher. Calls every realm at once, each from a thread of
+    its own so that the chunks of split requests may still use the
+    transport's workers, then tags the responses by realm
+    """
+    if len(calls) == 1:
+        return dict((realm, call()) for realm, call in calls)
+    with ThreadPoolExecutor(len(calls)) as pool:
+        futures = [(realm, pool.submit(call)) for realm, call in calls]
+        return dict((realm, future.result()) for realm, future in futures)
+
+
 def automerge(checkparam, limit, index=None):
     r"""
     Auto-split requests into chunk sizes accepted by the API.
 
+    The parameter may be any iterable, including generators and other
+    iterators that can only be read once. It is read a chunk at a time, so it
+    never has to be held in memory all at once.
+
+    Chunks are handed to the ``dispatch`` method of the transport passed in as
+    ``session``, if it has one, which lets asynchronous transports send them
+    all at once. Otherwise they are requested one after another.
+
     :param checkparam: Parameter to check
     :param int limit: Maximum length allowed (by API) for "checkparam"
     :param int index: Index of parameter if it is a positional argument
@@ -38,34 +101,51 @@ def automerge(checkparam, limit, index=None):
                     param = kwargs[checkparam]
                 except KeyError:
                     return func(*args, **kwargs)
+            if _not_iter(param):
+                return func(*args, **kwargs)
             try:
-                if len(param) > limit:
-                    first = None
-                    for l in chunker(param, limit):
-                        if not first:
-                            if index is None:
-                                kwargs[checkparam] = l
-                            else:
-                                args = (args[:index] +
-                                        (l, ) + args[index + 1:])
-                            first = func(*args, **kwargs)
-                        else:
-                            if index is None:
-                                kwargs[checkparam] = l
-                            else:
-                                args = (args[:index] +
-                                        (l, ) + args[index + 1:])
-                            res = func(*args, **kwargs)
-                            first += res
-                    return first
-                else:
+                if len(param) <= limit:
                     return func(*args, **kwargs)
             except TypeError:
-                return func(*args, **kwargs)
+                pass
+
+            def bind(chunk):
+                if index is None:
+                    return partial(func, *args, **dict(
+                        kwargs, **{checkparam: chunk}))
+                return partial(func, *(args[:index] + (chunk, ) +
+                                       args[index + 1:]), **kwargs)
+
+            chunks = chunker(param, limit)
+            head = list(islice(chunks, 2))
+            if len(head) < 2:
+                return bind(head[0] if head else [])()
+            calls = (bind(chunk) for chunk in chain(head, chunks))
+            dispatch = getattr(kwargs.get('session'), 'dispatch', _dispatch)
+            return dispatch(calls, _merge)
         return wrapper
     return decorate
 
 
+def _dispatch(calls, merge):
+    r"""
+    Default chunk dispatcher. Sends each request in order, then merges them
+    """
+    return merge(call() for call in calls)
+
+
+def _merge(results):
+    r"""
+    Combine the responses of a split request into the first one, assembling
+    the merged ``data`` and ``meta`` in a single pass
+    """
+    results = iter(results)
+    first = next(results, None)
+    if first is None:
+        return None
+    return first._extend(results)
+
+
 def _join_param(param):
     r"""
     Utility method to perform a :py:func:`join` on parameters, if necessary
@@ -77,24 +157,103 @@ def _not_iter(item):
     r"""
     Helper function to determine if the object can be iterated over. Used for
     protecting against invalid input by user for parameters that need to be
-    `join`'d
+    `join`'d. Integers of any type, such as NumPy's, count as single values
     """
-    return item is None or any(isinstance(item, i) for i in [str, int])
+    if item is None or isinstance(item, (str, numbers.Integral)):
+        return True
+    try:
+        iter(item)
+    except TypeError:
+        return True
+    return False
 
 
 def chunker(seq, size):
     r"""
-    Break data down into sizable chunks.
+    Break data down into sizable chunks, reading it only once.
 
-    All credit goes to https://stackoverflow.com/a/434328
-    :param seq: Iterable data
-    :type seq: list or tuple
+    :param seq: Data to split. Lists and tuples are sliced; anything else,
+                including generators and other one-shot iterators, is read
+                ``size`` items at a time
+    :type seq: iterable
     :param int size: Maximum length per chunk
     :return: Segmented data
-    :rtype: list
+    :rtype: generator(list)
     """
-    for pos in range(0, len(seq), size):
-        if isinstance(seq, Iterable):
-            yield [s for s in islice(seq, pos, pos + size)]
-        else:
+    if isinstance(seq, (list, tuple)):
+        for pos in range(0, len(seq), size):
             yield seq[pos:pos + size]
+        return
+    items = iter(seq)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _last_page(page, page_no, limit):
+    r"""
+    Determine if a page of a paginated listing is the final one, either from
+    the total reported in its metadata or, failing that, from it holding fewer
+    entries than requested
+    """
+    meta = getattr(page, 'meta', None) or {}
+    if 'total' in meta:
+        return page_no * limit >= meta['total']
+    return len(page.data) < limit
+
+
+def _paginate(request, page_no, limit, prefetch):
+    r"""
+    Yield every entry of a paginated listing, starting from ``page_no``.
+
+    Up to ``prefetch`` pages past the one being read are requested ahead of
+    time from background threads.
+
+    :param request: Function retrieving a page, given its number
+    :param int page_no: First page to retrieve
+    :param int limit: Entries requested per page
+    :param int prefetch: Pages to request ahead of time
+    """
+    if prefetch < 1:
+        while True:
+            page = request(page_no)
+            for entry in page.data:
+                yield entry
+            if _last_page(page, page_no, limit):
+                return
+            page_no += 1
+    with ThreadPoolExecutor(prefetch) as pool:
+        pending = deque(pool.submit(request, n)
+                        for n in range(page_no, page_no + prefetch + 1))
+        try:
+            while True:
+                page = pending.popleft().result()
+                for entry in page.data:
+                    yield entry
+                if _last_page(page, page_no, limit):
+                    return
+                page_no += 1
+                pending.append(pool.submit(request, page_no + prefetch))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _write(path, data):
+    r"""
+    Atomically write a file, so that concurrent readers never see it partially
+    written
+    """
+    directory = os.path.dirname(path) or os.curdir
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+    fd, temp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    _replace(temp, path)